@@ -4,8 +4,11 @@ Main entry point for the application
 """
 
 import asyncio
+import json
+import signal
 import sys
 import os
+import threading
 from pathlib import Path
 from loguru import logger
 
@@ -17,6 +20,10 @@ from src.core.content_analyzer import ContentAnalyzer
 from src.core.platform_manager import PlatformManager
 from src.utils.config import Config
 from src.utils.scheduler import ClippyScheduler
+from src.utils.fast_fs import unlink_with_sizes, unlink_matching
+
+# Working directories created at startup
+DIRS = ("downloads", "output", "temp", "logs", "models")
 
 
 class ClippyAgent:
@@ -27,10 +34,17 @@ class ClippyAgent:
         self.config = Config(config_path)
         self.setup_logging()
         
+        # Settings read on every video, resolved once
+        self._cleanup_cfg = self.config.get("cleanup", {}) or {}
+        self._auto_post = self.config.get("platforms", {}).get("auto_post", True)
+        self._temp_path = Path(self.config.get("video", {}).get("temp_path", "./temp"))
+        self._max_parallel_clips = max(1, min(os.cpu_count() or 1, self.config.get("video.max_parallel_clips", 2)))
+        
         # Initialize core components
         self.video_processor = VideoProcessor(self.config)
         self.content_analyzer = ContentAnalyzer(self.config)
         self.platform_manager = PlatformManager(self.config)
+        self._active_platform_count = len(self.platform_manager.get_active_platforms())
         self.scheduler = ClippyScheduler(self.config)
         
         logger.info("🎬 Clippy AI Agent initialized successfully!")
@@ -42,8 +56,9 @@ class ClippyAgent:
         # Remove default logger
         logger.remove()
         
-        # Add console logger with colors if enabled
-        if log_config.get("console_colors", True):
+        # Add console logger with colors if enabled and stderr is a terminal;
+        # piped or redirected output skips the markup parsing entirely
+        if log_config.get("console_colors", True) and sys.stderr.isatty():
             logger.add(
                 sys.stderr,
                 level=log_config.get("level", "INFO"),
@@ -51,7 +66,12 @@ class ClippyAgent:
                 colorize=True
             )
         else:
-            logger.add(sys.stderr, level=log_config.get("level", "INFO"))
+            logger.add(
+                sys.stderr,
+                level=log_config.get("level", "INFO"),
+                format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+                colorize=False
+            )
         
         # Add file logger if specified
         if log_file := log_config.get("file"):
@@ -98,33 +118,9 @@ class ClippyAgent:
             
             logger.info(f"✨ Found {len(highlights)} potential clips")
             
-            # Step 3: Generate clips
-            logger.info("🎞️ Step 3: Video clipping and editing")
-            clips = []
-            
-            for i, highlight in enumerate(highlights, 1):
-                logger.info(f"🔄 Processing clip {i}/{len(highlights)}")
-                
-                clip_data = await self.video_processor.create_clip(
-                    video_data,
-                    highlight,
-                    title_override=title
-                )
-                
-                if clip_data:
-                    clips.append(clip_data)
-                    logger.success(f"✅ Clip {i} created successfully")
-                else:
-                    logger.warning(f"⚠️ Failed to create clip {i}")
-            
-            # Step 4: Platform posting
-            if clips and self.config.get("platforms", {}).get("auto_post", True):
-                logger.info("📱 Step 4: Platform-specific posting")
-                posting_results = await self.platform_manager.post_clips(clips)
-                
-                # Step 5: Cleanup files after successful posting
-                if self.config.get("cleanup", {}).get("enabled", True):
-                    await self._cleanup_files(video_data, clips, posting_results)
+            posting_tasks = [] if self._posts_while_clipping() else None
+            clips = await self._create_clips(video_data, highlights, title, posting_tasks)
+            await self._post_clips(video_data, clips, posting_tasks)
             
             logger.success(f"🎉 Video processing complete! Generated {len(clips)} clips")
             return clips
@@ -133,41 +129,262 @@ class ClippyAgent:
             logger.error(f"❌ Error processing video: {str(e)}")
             return []
     
-    async def batch_process(self, input_list: list) -> dict:
+    def _posts_while_clipping(self) -> bool:
+        """Check whether clips can be uploaded while the remaining ones render"""
+        # Scheduled posts are spread across time slots as a group, so only
+        # immediate posting can overlap with clip generation
+        return (
+            self._auto_post
+            and not self.platform_manager.is_scheduling_enabled()
+        )
+    
+    async def _create_clips(self, video_data: dict, highlights: list, title: str = None,
+                            posting_tasks: list = None) -> list:
+        """
+        Generate clips for every highlight of an analyzed video
+        
+        Args:
+            video_data: Video data with transcript
+            highlights: Highlights found by the content analyzer
+            title: Optional title override
+            posting_tasks: If given, each clip starts uploading as soon as it
+                is rendered and the posting task is appended here
+            
+        Returns:
+            List of generated clips with metadata
+        """
+        # Step 3: Generate clips
+        logger.info("🎞️ Step 3: Video clipping and editing")
+        
+        # Clips are independent segments of the same source, so render
+        # several at once (bounded by CPU cores and config)
+        semaphore = asyncio.Semaphore(self._max_parallel_clips)
+        
+        clip_results = await asyncio.gather(*[
+            self._bounded_create_clip(semaphore, video_data, highlight, title, posting_tasks)
+            for highlight in highlights
+        ])
+        
+        clips = []
+        for i, clip_data in enumerate(clip_results, 1):
+            if clip_data:
+                clips.append(clip_data)
+            else:
+                logger.warning(f"⚠️ Failed to create clip {i}")
+        
+        logger.success(f"✅ Created {len(clips)}/{len(highlights)} clips")
+        
+        return clips
+    
+    async def _bounded_create_clip(self, semaphore: asyncio.Semaphore, video_data: dict, highlight: dict,
+                                   title: str = None, posting_tasks: list = None):
+        """
+        Create one clip while holding a slot of the clip semaphore
+        
+        Args:
+            semaphore: Semaphore limiting concurrent clip renders
+            video_data: Video data with transcript
+            highlight: Highlight to render
+            title: Optional title override
+            posting_tasks: If given, the posting task for the clip is appended here
+            
+        Returns:
+            Clip data, or None if the clip could not be created
+        """
+        async with semaphore:
+            clip_data = await self.video_processor.create_clip(
+                video_data,
+                highlight,
+                title_override=title
+            )
+        
+        if clip_data and posting_tasks is not None:
+            posting_tasks.append(asyncio.create_task(
+                self.platform_manager.post_clip(clip_data)
+            ))
+        
+        return clip_data
+    
+    async def _post_clips(self, video_data: dict, clips: list, posting_tasks: list = None):
+        """
+        Post generated clips and clean up files afterwards
+        
+        Args:
+            video_data: Original video information
+            clips: List of generated clip data
+            posting_tasks: Uploads already started by _create_clips, if any
+        """
+        # Step 4: Platform posting
+        if clips and self._auto_post:
+            if posting_tasks:
+                logger.info("📱 Step 4: Waiting for platform uploads to finish")
+                clip_results = await asyncio.gather(*posting_tasks)
+                posting_results = self.platform_manager.summarize_post_results(clip_results, len(clips))
+                logger.success(f"📊 Multi-platform posting complete: {posting_results['successful_posts']} successful, {posting_results['failed_posts']} failed")
+            else:
+                logger.info("📱 Step 4: Platform-specific posting")
+                posting_results = await self.platform_manager.post_clips(clips)
+            
+            # Step 5: Cleanup files after successful posting
+            if self._cleanup_cfg.get("enabled", True):
+                await self._cleanup_files(video_data, clips, posting_results)
+    
+    async def batch_process(self, input_list) -> dict:
         """
         Process multiple videos in batch
         
+        Videos flow through a pipeline of stages (download → transcribe →
+        analyze → clip → post) connected by queues. Each stage has its own
+        workers, so one video can be uploading while another is transcribed
+        and a third is downloading.
+        
         Args:
-            input_list: List of video sources (URLs or file paths)
+            input_list: List or async iterable of video sources (URLs or file
+                paths). Async iterables are consumed as the pipeline has room,
+                so processing starts before the whole input is read.
             
         Returns:
             Dictionary with processing results
         """
-        logger.info(f"🚀 Starting batch processing of {len(input_list)} videos")
+        if hasattr(input_list, "__len__"):
+            logger.info(f"🚀 Starting batch processing of {len(input_list)} videos")
+        else:
+            logger.info("🚀 Starting batch processing")
         
         results = {
-            "total_videos": len(input_list),
+            "total_videos": 0,
             "successful": 0,
             "failed": 0,
             "total_clips": 0,
             "clips": []
         }
         
-        for i, video_source in enumerate(input_list, 1):
-            logger.info(f"📹 Processing video {i}/{len(input_list)}: {video_source}")
-            
-            clips = await self.process_video(video_source)
-            
+        # Workers per stage, sized to the resource each stage uses
+        max_concurrent = max(1, self.config.get("batch.max_concurrent", 4))
+        workers_config = self.config.get("batch.workers", {}) or {}
+        stages = [
+            ("download", self._stage_download, workers_config.get("download", max_concurrent)),
+            ("transcribe", self._stage_transcribe, workers_config.get("transcribe", 1)),
+            ("analyze", self._stage_analyze, workers_config.get("analyze", 2)),
+            ("clip", self._stage_clip, workers_config.get("clip", max_concurrent)),
+            ("post", self._stage_post, workers_config.get("post", max_concurrent)),
+        ]
+        
+        # Bounded queues between stages give backpressure, so downloads can't
+        # pile up on disk faster than they are transcribed
+        queues = [
+            asyncio.Queue(maxsize=2 * max(1, workers)) for _, _, workers in stages
+        ]
+        
+        workers = []
+        for stage_index, (name, handler, count) in enumerate(stages):
+            next_queue = queues[stage_index + 1] if stage_index + 1 < len(stages) else None
+            for _ in range(max(1, count)):
+                workers.append(asyncio.create_task(
+                    self._stage_worker(name, handler, queues[stage_index], next_queue)
+                ))
+        
+        # Feed sources as the download stage frees up, then drain. Jobs only
+        # move forward, so joining the queues in order means every job has
+        # either finished or dropped out of the pipeline
+        jobs = []
+        try:
+            async for source in _iter_sources(input_list):
+                job = {"source": source, "clips": []}
+                jobs.append(job)
+                await queues[0].put(job)
+            
+            for queue in queues:
+                await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        
+        results["total_videos"] = len(jobs)
+        all_clips = results["clips"]
+        extend_clips = all_clips.extend
+        for job in jobs:
+            clips = job["clips"]
             if clips:
-                results["successful"] += 1
-                results["total_clips"] += len(clips)
-                results["clips"].extend(clips)
+                extend_clips(clips)
             else:
                 results["failed"] += 1
+        results["successful"] = len(jobs) - results["failed"]
+        results["total_clips"] = len(all_clips)
         
         logger.info(f"📊 Batch processing complete: {results['successful']}/{results['total_videos']} successful")
         return results
     
+    async def _stage_worker(self, name: str, handler, in_queue: asyncio.Queue, out_queue: asyncio.Queue = None):
+        """
+        Consume jobs from a pipeline stage queue and feed the next stage
+        
+        Args:
+            name: Stage name used in logs
+            handler: Coroutine function updating the job, returns False to drop it
+            in_queue: Queue this stage consumes from
+            out_queue: Queue of the next stage (None for the last stage)
+        """
+        while True:
+            job = await in_queue.get()
+            try:
+                try:
+                    keep_going = await handler(job)
+                except Exception as e:
+                    logger.error(f"❌ Error in {name} stage for {job['source']}: {e}")
+                    job["clips"] = []
+                    keep_going = False
+                
+                if keep_going and out_queue is not None:
+                    await out_queue.put(job)
+                else:
+                    # Job is leaving the pipeline, keep only the result
+                    for key in ("video_data", "highlights", "posting_tasks"):
+                        job.pop(key, None)
+            finally:
+                in_queue.task_done()
+    
+    async def _stage_download(self, job: dict) -> bool:
+        """Pipeline stage: download or locate the input video"""
+        logger.info(f"📹 Processing video: {job['source']}")
+        job["video_data"] = await self.video_processor.prepare_input(job["source"])
+        if not job["video_data"]:
+            logger.error(f"❌ Failed to process video input: {job['source']}")
+            return False
+        return True
+    
+    async def _stage_transcribe(self, job: dict) -> bool:
+        """Pipeline stage: transcribe the downloaded video"""
+        job["video_data"] = await self.video_processor.transcribe_input(job["video_data"])
+        return job["video_data"] is not None
+    
+    async def _stage_analyze(self, job: dict) -> bool:
+        """Pipeline stage: detect highlights in the transcript"""
+        video_data = job["video_data"]
+        job["highlights"] = await self.content_analyzer.find_highlights(
+            video_data["transcript"],
+            video_data["metadata"]
+        )
+        if not job["highlights"]:
+            logger.warning(f"⚠️ No highlights found in video: {job['source']}")
+            return False
+        return True
+    
+    async def _stage_clip(self, job: dict) -> bool:
+        """Pipeline stage: render clips for every highlight"""
+        job["posting_tasks"] = [] if self._posts_while_clipping() else None
+        job["clips"] = await self._create_clips(
+            job["video_data"], job["highlights"], posting_tasks=job["posting_tasks"]
+        )
+        return bool(job["clips"])
+    
+    async def _stage_post(self, job: dict) -> bool:
+        """Pipeline stage: post clips and clean up"""
+        await self._post_clips(job["video_data"], job["clips"], job.get("posting_tasks"))
+        logger.success(f"🎉 Video processing complete! Generated {len(job['clips'])} clips")
+        return True
+    
     async def _cleanup_files(self, video_data: dict, clips: list, posting_results: dict):
         """
         Clean up source video and generated clips after successful posting
@@ -178,80 +395,106 @@ class ClippyAgent:
             posting_results: Results from platform posting
         """
         try:
-            cleanup_config = self.config.get("cleanup", {})
+            cleanup_config = self._cleanup_cfg
             
             # Check if cleanup is enabled
             if not cleanup_config.get("enabled", True):
                 return
             
-            # Determine cleanup strategy
-            cleanup_strategy = cleanup_config.get("strategy", "after_successful_posts")
-            
-            should_cleanup = False
-            
-            if cleanup_strategy == "always":
-                should_cleanup = True
-                logger.info("🧹 Cleanup strategy: Always delete files")
-            elif cleanup_strategy == "after_successful_posts":
-                # Check if at least one platform posted successfully
-                successful_posts = posting_results.get("successful", 0) if posting_results else 0
-                should_cleanup = successful_posts > 0
-                logger.info(f"🧹 Cleanup strategy: Delete after successful posts ({successful_posts} successful)")
-            elif cleanup_strategy == "after_all_posts":
-                # Only cleanup if all platforms posted successfully
-                total_expected = len(clips) * len(self.platform_manager.get_active_platforms())
-                successful_posts = posting_results.get("successful", 0) if posting_results else 0
-                should_cleanup = successful_posts == total_expected
-                logger.info(f"🧹 Cleanup strategy: Delete only if all posts successful ({successful_posts}/{total_expected})")
-            
-            if not should_cleanup:
+            if not self._should_cleanup(cleanup_config.get("strategy", "after_successful_posts"), clips, posting_results):
                 logger.info("🧹 Cleanup skipped - conditions not met")
                 return
             
+            # Filesystem work runs on a worker thread so slow storage doesn't
+            # stall uploads still in flight on the event loop
+            await asyncio.to_thread(self._do_cleanup_sync, video_data, clips, cleanup_config)
+            
+        except Exception as e:
+            logger.error(f"❌ Error during cleanup: {e}")
+    
+    def _should_cleanup(self, cleanup_strategy: str, clips: list, posting_results: dict) -> bool:
+        """
+        Decide whether files can be deleted under the configured strategy
+        
+        Args:
+            cleanup_strategy: always, after_successful_posts or after_all_posts
+            clips: List of generated clip data
+            posting_results: Results from platform posting
+            
+        Returns:
+            True if cleanup should run
+        """
+        if cleanup_strategy == "always":
+            logger.debug("🧹 Cleanup strategy: Always delete files")
+            return True
+        
+        successful_posts = posting_results.get("successful_posts", 0) if posting_results else 0
+        
+        if cleanup_strategy == "after_successful_posts":
+            # At least one platform posted successfully
+            logger.debug(f"🧹 Cleanup strategy: Delete after successful posts ({successful_posts} successful)")
+            return successful_posts > 0
+        
+        if cleanup_strategy == "after_all_posts":
+            # Every clip posted successfully on every platform
+            total_expected = len(clips) * self._active_platform_count
+            logger.debug(f"🧹 Cleanup strategy: Delete only if all posts successful ({successful_posts}/{total_expected})")
+            return successful_posts == total_expected
+        
+        return False
+    
+    def _do_cleanup_sync(self, video_data: dict, clips: list, cleanup_config: dict):
+        """
+        Delete the files selected by the cleanup settings (blocking)
+        
+        Args:
+            video_data: Original video information
+            clips: List of generated clip data
+            cleanup_config: Cleanup section of the configuration
+        """
+        try:
+            # Collect every file to delete first, then remove them in one batch
+            candidates = []
+            
+            # Source video file and its metadata
+            if cleanup_config.get("delete_source", True) and video_data.get("file_path"):
+                source_path = Path(video_data["file_path"])
+                candidates.append(("source video", source_path))
+                candidates.append(("metadata", source_path.with_suffix('.info.json')))
+            
+            # Generated clips
+            if cleanup_config.get("delete_clips", True):
+                candidates.extend(("clip", Path(clip["file_path"])) for clip in clips if clip.get("file_path"))
+            
+            # Temporary files registered by the video processor
+            delete_temp = cleanup_config.get("delete_temp", True)
+            if delete_temp and "temp_files" in video_data:
+                candidates.extend(("temp file", Path(temp_file)) for temp_file in video_data["temp_files"])
+            
+            sizes = unlink_with_sizes([path for _, path in candidates])
+            deleted = [
+                (label, path, file_size)
+                for (label, path), file_size in zip(candidates, sizes)
+                if file_size is not None
+            ]
+            
+            # Older video data without a manifest: scan the temp folder for
+            # names containing the video id (same match as "*{video_id}*")
+            video_id = video_data.get('video_id')
+            if delete_temp and "temp_files" not in video_data and video_id:
+                deleted.extend(
+                    ("temp file", path, file_size)
+                    for path, file_size in unlink_matching(self._temp_path, video_id)
+                )
+            
             files_deleted = 0
             space_freed = 0
             
-            # Delete source video file
-            if cleanup_config.get("delete_source", True):
-                source_path = Path(video_data.get("file_path", ""))
-                if source_path.exists():
-                    file_size = source_path.stat().st_size
-                    source_path.unlink()
-                    files_deleted += 1
-                    space_freed += file_size
-                    logger.info(f"🗑️ Deleted source video: {source_path.name} ({file_size / 1024 / 1024:.1f}MB)")
-                
-                # Also delete metadata file if exists
-                info_path = source_path.with_suffix('.info.json')
-                if info_path.exists():
-                    info_path.unlink()
-                    files_deleted += 1
-                    logger.info(f"🗑️ Deleted metadata: {info_path.name}")
-            
-            # Delete generated clips
-            if cleanup_config.get("delete_clips", True):
-                for clip in clips:
-                    clip_path = Path(clip.get("file_path", ""))
-                    if clip_path.exists():
-                        file_size = clip_path.stat().st_size
-                        clip_path.unlink()
-                        files_deleted += 1
-                        space_freed += file_size
-                        logger.info(f"🗑️ Deleted clip: {clip_path.name} ({file_size / 1024 / 1024:.1f}MB)")
-            
-            # Clean up temporary files
-            if cleanup_config.get("delete_temp", True):
-                temp_pattern = f"*{video_data.get('video_id', 'unknown')}*"
-                temp_path = Path(self.config.get("video", {}).get("temp_path", "./temp"))
-                
-                if temp_path.exists():
-                    for temp_file in temp_path.glob(temp_pattern):
-                        if temp_file.is_file():
-                            file_size = temp_file.stat().st_size
-                            temp_file.unlink()
-                            files_deleted += 1
-                            space_freed += file_size
-                            logger.info(f"🗑️ Deleted temp file: {temp_file.name}")
+            for label, path, file_size in deleted:
+                files_deleted += 1
+                space_freed += file_size
+                size_mb = file_size / (1024 * 1024)
+                logger.debug(f"🗑️ Deleted {label}: {path.name} ({size_mb:.1f}MB)")
             
             logger.success(f"🧹 Cleanup complete: {files_deleted} files deleted, {space_freed / 1024 / 1024:.1f}MB freed")
             
@@ -269,6 +512,87 @@ class ClippyAgent:
         self.scheduler.stop()
 
 
+async def _ensure_dirs():
+    """Create the working directories in one worker-thread hop"""
+    await asyncio.to_thread(lambda: [Path(directory).mkdir(exist_ok=True) for directory in DIRS])
+
+
+async def _iter_sources(sources):
+    """Iterate a list or async iterable of video sources asynchronously"""
+    if hasattr(sources, "__aiter__"):
+        async for source in sources:
+            yield source
+    else:
+        for source in sources:
+            yield source
+
+
+async def _iter_batch_lines(path: str):
+    """
+    Stream non-empty lines of a batch file
+    
+    The file is read in chunks on a worker thread, so large batch files
+    neither block the event loop nor have to fit in memory.
+    
+    Args:
+        path: Batch file with one video source per line
+    """
+    batch_file = await asyncio.to_thread(open, path, 'r')
+    try:
+        while True:
+            lines = await asyncio.to_thread(batch_file.readlines, 65536)
+            if not lines:
+                break
+            for line in lines:
+                line = line.strip()
+                if line:
+                    yield line
+    finally:
+        batch_file.close()
+
+
+def _read_line(prompt: str) -> asyncio.Future:
+    """
+    Read one line of stdin without blocking the event loop
+    
+    A daemon thread does the blocking read, so Ctrl+C can end the wait:
+    asyncio.run would hang joining an executor thread stuck in input().
+    The thread reads the raw stream, which has no lock for interpreter
+    shutdown to trip over while the read is still pending.
+    
+    Args:
+        prompt: Prompt shown before reading
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def settle(result, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    
+    def read():
+        try:
+            raw = sys.stdin.buffer.raw.readline()
+            if not raw:
+                raise EOFError("EOF when reading a line")
+            line, error = raw.decode(sys.stdin.encoding or "utf-8", errors="replace").rstrip("\r\n"), None
+        except Exception as e:
+            line, error = None, e
+        try:
+            loop.call_soon_threadsafe(settle, line, error)
+        except RuntimeError:
+            # Loop already closed
+            pass
+    
+    print(prompt, end="", flush=True)
+    threading.Thread(target=read, daemon=True).start()
+    return future
+
+
 async def main():
     """Main function for CLI usage"""
     import argparse
@@ -282,6 +606,9 @@ async def main():
     
     args = parser.parse_args()
     
+    # Ensure required directories exist
+    await _ensure_dirs()
+    
     # Initialize Clippy
     clippy = ClippyAgent(args.config)
     
@@ -292,10 +619,18 @@ async def main():
             clippy.start_scheduler()
             
             # Keep running until interrupted
+            stop = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(sig, stop.set)
+                except NotImplementedError:
+                    # Not supported on Windows; Ctrl+C cancels the wait instead
+                    pass
+            
             try:
-                while True:
-                    await asyncio.sleep(60)
-            except KeyboardInterrupt:
+                await stop.wait()
+            finally:
                 logger.info("👋 Shutdown requested")
                 clippy.stop_scheduler()
                 
@@ -305,11 +640,9 @@ async def main():
                 logger.error(f"❌ Batch file not found: {args.batch}")
                 return
             
-            with open(args.batch, 'r') as f:
-                video_list = [line.strip() for line in f if line.strip()]
-            
-            results = await clippy.batch_process(video_list)
-            logger.info(f"📊 Batch Results: {results}")
+            results = await clippy.batch_process(_iter_batch_lines(args.batch))
+            logger.info(f"📊 Batch Results: {results['successful']}/{results['total_videos']} ok, {results['total_clips']} clips")
+            logger.opt(lazy=True).debug("📊 Batch details: {}", lambda: json.dumps(results, default=str))
             
         elif args.input:
             # Single video processing
@@ -322,7 +655,7 @@ async def main():
             
             while True:
                 try:
-                    user_input = input("\n🎯 Video source (or 'quit' to exit): ").strip()
+                    user_input = (await _read_line("\n🎯 Video source (or 'quit' to exit): ")).strip()
                     
                     if user_input.lower() in ['quit', 'exit', 'q']:
                         break
@@ -331,7 +664,8 @@ async def main():
                         clips = await clippy.process_video(user_input)
                         logger.info(f"✨ Generated {len(clips)} clips")
                     
-                except KeyboardInterrupt:
+                except (KeyboardInterrupt, asyncio.CancelledError):
+                    # asyncio.run turns Ctrl+C into a cancel on Python 3.11+
                     break
             
             logger.info("👋 Thanks for using Clippy!")
@@ -342,9 +676,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    # Ensure required directories exist
-    for directory in ["downloads", "output", "temp", "logs", "models"]:
-        Path(directory).mkdir(exist_ok=True)
-    
     # Run the main function
     asyncio.run(main())
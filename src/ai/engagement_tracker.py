@@ -3,20 +3,154 @@ Engagement tracking and performance analytics
 """
 
 import asyncio
+import atexit
+import heapq
 import json
+from collections import defaultdict
+from functools import lru_cache
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
 from pathlib import Path
-import statistics
+import math
+import sys
+import weakref
 
+import numpy as np
 from loguru import logger
 
 from ..utils.config import Config
-from ..utils.file_handler import FileHandler
+from ..utils.file_handler import FileHandler, ZSTD_AVAILABLE
+from ..utils.metrics_db import MetricsDB
+
+# Engagement metrics tracked per platform
+METRIC_TYPES = ("views", "likes", "comments", "shares", "saves")
+
+# Clip duration groups used in content insights (seconds, [min, max))
+DURATION_GROUPS = {
+    "short": (0, 30),
+    "medium": (30, 45),
+    "long": (45, 65)
+}
+
+# Group boundaries for np.digitize: bin i (1-based) is the i-th group above
+DURATION_EDGES = [0, 30, 45, 65]
+
+# Trackers not closed yet; records they still queue are written when the interpreter exits
+_OPEN_TRACKERS = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_trackers():
+    """Write records queued by trackers whose owners never awaited aclose()"""
+    for tracker in list(_OPEN_TRACKERS):
+        tracker._flush_at_exit()
+
+# "HH:00" posting time label for each hour of the day
+HOUR_LABELS = tuple(f"{hour:02d}:00" for hour in range(24))
+
+
+def _median(values: List[float]) -> float:
+    """Median of a non-empty list with a single sort"""
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[middle]
+    return (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def _intern_keys(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a dict with its keys interned"""
+    return {sys.intern(key): value for key, value in data.items()}
+
+
+def _intern_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of a tracking entry with its field, emotion and platform names interned
+    
+    These strings repeat across every entry, but entries decoded one at a
+    time (log replay, SQLite rows) each get their own copies. Interning
+    makes all entries share one object per name, which is most of the
+    per-entry saving a slotted record class would give while entries stay
+    plain JSON-shaped dicts, and lets dict lookups on the names
+    short-circuit on identity.
+    """
+    entry = _intern_keys(entry)
+    
+    emotion = entry.get("emotion")
+    if isinstance(emotion, str):
+        entry["emotion"] = sys.intern(emotion)
+    
+    platforms = entry.get("platforms")
+    if platforms:
+        entry["platforms"] = {
+            sys.intern(platform): _intern_keys(result) if isinstance(result, dict) else result
+            for platform, result in platforms.items()
+        }
+    
+    if "metrics" in entry:
+        entry["metrics"] = {
+            sys.intern(metric_type): _intern_keys(platform_values)
+            for metric_type, platform_values in entry["metrics"].items()
+        }
+    
+    if "_totals" in entry:
+        entry["_totals"] = _intern_keys(entry["_totals"])
+    
+    return entry
+
+
+@lru_cache(maxsize=4096)
+def _score_from_totals(views: int, likes: int, comments: int, shares: int,
+                       viral_threshold: int) -> float:
+    """
+    Weighted 0-100 performance score from cross-platform totals
+    
+    Pure function of its arguments, so results are memoized: entries with
+    the same totals (e.g. unchanged since the last update) hit the cache.
+    """
+    if views == 0:
+        return 0.0
+    
+    # Calculate engagement ratios
+    like_ratio = likes / views
+    comment_ratio = comments / views
+    share_ratio = shares / views
+    
+    # Weighted performance score
+    score = (
+        like_ratio * 40 +      # 40% weight on likes
+        comment_ratio * 30 +   # 30% weight on comments
+        share_ratio * 20 +     # 20% weight on shares
+        min(views / viral_threshold, 1.0) * 10  # 10% weight on view count
+    )
+    
+    return min(score * 100, 100)  # Scale to 0-100
+
+
+@dataclass
+class TrendAggregates:
+    """Per-group accumulators gathered in a single pass over the metrics"""
+    # Column arrays, one row per clip
+    scores: np.ndarray = None
+    durations: np.ndarray = None
+    emotion_codes: np.ndarray = None
+    hours: np.ndarray = None           # -1 when the post time is unknown
+    viral: np.ndarray = None
+    emotions: List[str] = field(default_factory=list)  # emotion name per code
+    
+    platform_stats: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
 
 class EngagementTracker:
-    """Tracks engagement metrics and analyzes performance patterns"""
+    """
+    Tracks engagement metrics and analyzes performance patterns
+    
+    Metric changes are written by a debounced background flusher. Owners
+    must await aclose() on shutdown to write queued records and compact the
+    log; as a last resort, records still queued at interpreter exit are
+    written synchronously by an atexit hook.
+    """
     
     def __init__(self, config: Config):
         """Initialize engagement tracker"""
@@ -26,20 +160,70 @@ class EngagementTracker:
         
         # Data storage
         self.metrics_file = Path("analytics/engagement_metrics.json")
+        self.compressed_metrics_file = Path("analytics/engagement_metrics.json.zst")
+        self.metrics_log = Path("analytics/engagement_metrics.log.jsonl")
         self.performance_file = Path("analytics/performance_data.json")
         self.trends_file = Path("analytics/trends.json")
         
         # Ensure analytics directory exists
         Path("analytics").mkdir(exist_ok=True)
         
+        # Snapshots are zstd-compressed when zstandard is installed
+        self.compress_metrics = ZSTD_AVAILABLE and self.analytics_config.get("compress_metrics", True)
+        
+        # Metrics live in a JSON snapshot plus change log, or in SQLite
+        self.metrics_db = None
+        if self.analytics_config.get("metrics_store", "json") == "sqlite":
+            self.metrics_db = MetricsDB("analytics/engagement.db")
+        
         # Load existing data
-        self.metrics_data = self.file_handler.load_json(self.metrics_file) or {}
+        if self.metrics_db is not None:
+            self.metrics_data = self.metrics_db.load_entries(METRIC_TYPES)
+        else:
+            self.metrics_data = self.file_handler.load_json(self._latest_snapshot_file()) or {}
+        self.metrics_data = {
+            clip_id: _intern_entry(entry) for clip_id, entry in self.metrics_data.items()
+        }
+        
         self.performance_data = self.file_handler.load_json(self.performance_file) or {}
         
+        # IDs of clips currently flagged viral, kept in step by _apply_metrics
+        self._viral_ids = {clip_id for clip_id, clip in self.metrics_data.items() if clip.get("is_viral")}
+        
         # Tracking thresholds
         self.viral_threshold = self.analytics_config.get("viral_threshold_views", 10000)
         self.good_performance_ratio = self.analytics_config.get("good_performance_likes_ratio", 0.05)
         self.comment_engagement_ratio = self.analytics_config.get("comment_engagement_ratio", 0.02)
+        
+        # Metric changes are appended to a log and folded into the snapshot
+        # every compact_every records
+        self.compact_every = self.analytics_config.get("metrics_compact_every", 100)
+        self._log_records = self._replay_metrics_log() if self.metrics_db is None else 0
+        
+        # Records are queued and written by a background flusher, so a burst
+        # of updates (one per platform) becomes a single append
+        self.flush_delay = 0.2
+        self._pending_records = []
+        self._dirty = None
+        self._flush_task = None
+        _OPEN_TRACKERS.add(self)
+        
+        # Analysis results are cached until the metrics change
+        self._metrics_version = 0
+        self._analysis_cache = {}
+        self._analysis_cache_version = -1
+    
+    def _get_cached_analysis(self, key: str) -> Optional[Any]:
+        """Return a cached analysis result if metrics haven't changed since it was computed"""
+        if self._analysis_cache_version != self._metrics_version:
+            self._analysis_cache = {}
+            self._analysis_cache_version = self._metrics_version
+        return self._analysis_cache.get(key)
+    
+    def _set_cached_analysis(self, key: str, result: Any) -> Any:
+        """Store an analysis result for the current metrics version"""
+        self._analysis_cache[key] = result
+        return result
     
     async def track_post_performance(self, clip_data: Dict[str, Any], 
                                    platform_results: Dict[str, Any]) -> Dict[str, Any]:
@@ -55,15 +239,19 @@ class EngagementTracker:
         """
         try:
             clip_id = clip_data.get("clip_id")
+            now = datetime.now()
+            timestamp = now.isoformat()
             
             tracking_entry = {
                 "clip_id": clip_id,
                 "title": clip_data.get("title", ""),
-                "emotion": clip_data.get("emotion", "neutral"),
+                "emotion": sys.intern(clip_data.get("emotion", "neutral")),
                 "engagement_score": clip_data.get("engagement_score", 0.0),
                 "duration": clip_data.get("duration", 0),
-                "posted_at": datetime.now().isoformat(),
-                "platforms": platform_results,
+                "posted_at": timestamp,
+                "posted_hour": now.hour,
+                "posted_weekday": now.weekday(),  # 0 = Monday
+                "platforms": {sys.intern(platform): result for platform, result in platform_results.items()},
                 "metrics": {
                     "views": {},
                     "likes": {},
@@ -71,15 +259,17 @@ class EngagementTracker:
                     "shares": {},
                     "saves": {}
                 },
+                "_totals": dict.fromkeys(METRIC_TYPES, 0),
                 "performance_score": 0.0,
                 "is_viral": False,
-                "last_updated": datetime.now().isoformat()
+                "last_updated": timestamp
             }
             
             # Store in metrics data
             if clip_id not in self.metrics_data:
                 self.metrics_data[clip_id] = tracking_entry
-                await self._save_metrics()
+                self._metrics_version += 1
+                await self._append_metrics_log({"op": "track", "entry": tracking_entry})
             
             logger.info(f"📊 Started tracking performance for: {clip_id}")
             return tracking_entry
@@ -95,58 +285,76 @@ class EngagementTracker:
                 logger.warning(f"⚠️ Clip not found in tracking data: {clip_id}")
                 return
             
-            clip_metrics = self.metrics_data[clip_id]
-            
-            # Update platform-specific metrics
-            for metric_type, value in metrics.items():
-                if metric_type in clip_metrics["metrics"]:
-                    clip_metrics["metrics"][metric_type][platform] = value
+            updated_at = datetime.now().isoformat()
+            self._apply_metrics(clip_id, platform, metrics, updated_at)
+            self._metrics_version += 1
             
-            # Update timestamp
-            clip_metrics["last_updated"] = datetime.now().isoformat()
-            
-            # Calculate performance score
-            clip_metrics["performance_score"] = await self._calculate_performance_score(clip_id)
-            
-            # Check if viral
-            total_views = sum(clip_metrics["metrics"]["views"].values())
-            clip_metrics["is_viral"] = total_views >= self.viral_threshold
-            
-            await self._save_metrics()
+            await self._append_metrics_log({
+                "op": "update",
+                "clip_id": clip_id,
+                "platform": platform,
+                "metrics": metrics,
+                "ts": updated_at
+            })
             logger.debug(f"📈 Updated metrics for {clip_id} on {platform}")
             
         except Exception as e:
             logger.error(f"❌ Error updating metrics: {e}")
     
+    def _apply_metrics(self, clip_id: str, platform: str, metrics: Dict[str, Any], updated_at: str):
+        """Apply a metrics update to the in-memory tracking entry"""
+        clip_metrics = self.metrics_data[clip_id]
+        totals = self._get_totals(clip_metrics)
+        platform = sys.intern(platform)
+        
+        # Update platform-specific metrics and keep the cross-platform totals in step
+        for metric_type, value in metrics.items():
+            if metric_type in clip_metrics["metrics"]:
+                platform_values = clip_metrics["metrics"][metric_type]
+                totals[metric_type] += value - platform_values.get(platform, 0)
+                platform_values[platform] = value
+        
+        # Update timestamp
+        clip_metrics["last_updated"] = updated_at
+        
+        # Calculate performance score
+        clip_metrics["performance_score"] = self._compute_performance_score(clip_metrics)
+        
+        # Check if viral
+        is_viral = totals["views"] >= self.viral_threshold
+        if is_viral != clip_metrics.get("is_viral", False):
+            if is_viral:
+                self._viral_ids.add(clip_id)
+            else:
+                self._viral_ids.discard(clip_id)
+        clip_metrics["is_viral"] = is_viral
+    
+    def _get_totals(self, clip_data: Dict[str, Any]) -> Dict[str, int]:
+        """Cross-platform metric totals of an entry, built once for entries saved without them"""
+        totals = clip_data.get("_totals")
+        if totals is None:
+            metrics = clip_data.get("metrics", {})
+            totals = {
+                metric_type: sum(metrics.get(metric_type, {}).values())
+                for metric_type in METRIC_TYPES
+            }
+            if metrics:
+                clip_data["_totals"] = totals
+        return totals
+    
     async def _calculate_performance_score(self, clip_id: str) -> float:
         """Calculate overall performance score for a clip"""
+        return self._compute_performance_score(self.metrics_data.get(clip_id, {}))
+    
+    def _compute_performance_score(self, clip_data: Dict[str, Any]) -> float:
+        """Calculate the performance score of a tracking entry"""
         try:
-            clip_data = self.metrics_data.get(clip_id, {})
-            metrics = clip_data.get("metrics", {})
-            
-            total_views = sum(metrics.get("views", {}).values())
-            total_likes = sum(metrics.get("likes", {}).values())
-            total_comments = sum(metrics.get("comments", {}).values())
-            total_shares = sum(metrics.get("shares", {}).values())
-            
-            if total_views == 0:
-                return 0.0
-            
-            # Calculate engagement ratios
-            like_ratio = total_likes / total_views
-            comment_ratio = total_comments / total_views
-            share_ratio = total_shares / total_views
-            
-            # Weighted performance score
-            score = (
-                like_ratio * 40 +      # 40% weight on likes
-                comment_ratio * 30 +   # 30% weight on comments
-                share_ratio * 20 +     # 20% weight on shares
-                min(total_views / self.viral_threshold, 1.0) * 10  # 10% weight on view count
+            totals = self._get_totals(clip_data)
+            return _score_from_totals(
+                totals["views"], totals["likes"], totals["comments"], totals["shares"],
+                self.viral_threshold
             )
             
-            return min(score * 100, 100)  # Scale to 0-100
-            
         except Exception as e:
             logger.error(f"❌ Error calculating performance score: {e}")
             return 0.0
@@ -154,64 +362,157 @@ class EngagementTracker:
     async def analyze_trends(self) -> Dict[str, Any]:
         """Analyze performance trends and patterns"""
         try:
+            cached = self._get_cached_analysis("trends")
+            if cached is not None:
+                return cached
+            
             logger.info("📊 Analyzing engagement trends...")
             
             if not self.metrics_data:
                 return {"error": "No performance data available"}
             
-            trends = {
-                "emotion_performance": await self._analyze_emotion_trends(),
-                "time_patterns": await self._analyze_time_patterns(),
-                "platform_performance": await self._analyze_platform_performance(),
-                "content_insights": await self._analyze_content_insights(),
-                "recommendations": await self._generate_recommendations(),
-                "last_analyzed": datetime.now().isoformat()
-            }
+            # The analysis runs on a worker thread over a snapshot of the
+            # entries, so posting and tracking keep running meanwhile
+            version = self._metrics_version
+            entries = list(self.metrics_data.values())
+            trends = await asyncio.to_thread(self._analyze_sync, entries)
             
             # Save trends
-            self.file_handler.save_json(trends, self.trends_file)
+            await self._write_json_async(trends, self.trends_file)
             
             logger.success("✅ Trend analysis complete")
+            
+            # Metrics that changed during the analysis make the result stale
+            if version == self._metrics_version:
+                self._set_cached_analysis("trends", trends)
             return trends
             
         except Exception as e:
             logger.error(f"❌ Error analyzing trends: {e}")
             return {"error": str(e)}
     
-    async def _analyze_emotion_trends(self) -> Dict[str, Any]:
-        """Analyze which emotions perform best"""
-        emotion_stats = {}
+    def _analyze_sync(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build the full trends report (blocking, run via asyncio.to_thread)
         
-        for clip_data in self.metrics_data.values():
-            emotion = clip_data.get("emotion", "neutral")
-            performance_score = clip_data.get("performance_score", 0)
-            
-            if emotion not in emotion_stats:
-                emotion_stats[emotion] = {
-                    "count": 0,
-                    "total_performance": 0,
-                    "viral_count": 0,
-                    "scores": []
-                }
+        Args:
+            entries: Tracking entries to analyze
             
-            emotion_stats[emotion]["count"] += 1
-            emotion_stats[emotion]["total_performance"] += performance_score
-            emotion_stats[emotion]["scores"].append(performance_score)
+        Returns:
+            Trends dictionary
+        """
+        aggregates = self._scan_all(entries)
+        
+        emotion_trends = self._analyze_emotion_trends(aggregates)
+        time_patterns = self._analyze_time_patterns(aggregates)
+        platform_performance = self._analyze_platform_performance(aggregates)
+        content_insights = self._analyze_content_insights(aggregates)
+        
+        return {
+            "emotion_performance": emotion_trends,
+            "time_patterns": time_patterns,
+            "platform_performance": platform_performance,
+            "content_insights": content_insights,
+            "recommendations": self._generate_recommendations(
+                aggregates, emotion_trends, time_patterns, platform_performance, content_insights
+            ),
+            "last_analyzed": datetime.now().isoformat()
+        }
+    
+    def _scan_all(self, entries: List[Dict[str, Any]]) -> TrendAggregates:
+        """
+        Collect everything the trend analyzers need in one pass over the entries
+        
+        Args:
+            entries: Tracking entries to scan
             
-            if clip_data.get("is_viral", False):
-                emotion_stats[emotion]["viral_count"] += 1
+        Returns:
+            Aggregates shared by all _analyze_* methods
+        """
+        aggregates = TrendAggregates()
+        emotion_codes = {}
+        platform_stats = defaultdict(lambda: {
+            "successful_posts": 0,
+            "total_performance": 0,
+            "viral_count": 0,
+            "scores": []
+        })
         
-        # Calculate averages and statistics
-        for emotion, stats in emotion_stats.items():
-            if stats["count"] > 0:
-                stats["average_performance"] = stats["total_performance"] / stats["count"]
-                stats["viral_rate"] = stats["viral_count"] / stats["count"]
-                stats["median_performance"] = statistics.median(stats["scores"])
-                
-                if len(stats["scores"]) > 1:
-                    stats["performance_std"] = statistics.stdev(stats["scores"])
-                else:
-                    stats["performance_std"] = 0
+        # Flat columns, converted to arrays after the scan
+        scores = []
+        durations = []
+        codes = []
+        hours = []
+        viral = []
+        
+        for clip_data in entries:
+            emotion = clip_data.get("emotion", "neutral")
+            performance_score = clip_data.get("performance_score", 0)
+            is_viral = clip_data.get("is_viral", False)
+            duration = clip_data.get("duration", 0)
+            
+            scores.append(performance_score)
+            durations.append(duration)
+            viral.append(is_viral)
+            
+            # Emotion
+            codes.append(emotion_codes.setdefault(emotion, len(emotion_codes)))
+            
+            # Posting hour, parsed from posted_at only for entries tracked
+            # before the hour was stored
+            hour = clip_data.get("posted_hour")
+            if hour is None:
+                hour = -1
+                posted_at = clip_data.get("posted_at")
+                if posted_at:
+                    try:
+                        hour = datetime.fromisoformat(posted_at.replace('Z', '+00:00')).hour
+                    except Exception as e:
+                        logger.warning(f"⚠️ Error parsing post time: {e}")
+            hours.append(hour)
+            
+            # Platform
+            for platform, result in clip_data.get("platforms", {}).items():
+                if result.get("success"):
+                    stats = platform_stats[platform]
+                    stats["successful_posts"] += 1
+                    stats["total_performance"] += performance_score
+                    stats["scores"].append(performance_score)
+                    if is_viral:
+                        stats["viral_count"] += 1
+        
+        aggregates.scores = np.asarray(scores, dtype=np.float64)
+        aggregates.durations = np.asarray(durations, dtype=np.float64)
+        aggregates.emotion_codes = np.asarray(codes, dtype=np.int32)
+        aggregates.hours = np.asarray(hours, dtype=np.int64)
+        aggregates.viral = np.asarray(viral, dtype=np.bool_)
+        aggregates.emotions = list(emotion_codes)
+        aggregates.platform_stats = dict(platform_stats)
+        
+        return aggregates
+    
+    def _analyze_emotion_trends(self, aggregates: TrendAggregates) -> Dict[str, Any]:
+        """Analyze which emotions perform best"""
+        emotion_stats = {}
+        
+        # Calculate averages and statistics per emotion column slice
+        for code, emotion in enumerate(aggregates.emotions):
+            mask = aggregates.emotion_codes == code
+            scores = aggregates.scores[mask]
+            count = int(scores.size)
+            total_performance = float(scores.sum())
+            viral_count = int(aggregates.viral[mask].sum())
+            
+            emotion_stats[emotion] = {
+                "count": count,
+                "total_performance": total_performance,
+                "viral_count": viral_count,
+                "scores": scores.tolist(),
+                "average_performance": total_performance / count,
+                "viral_rate": viral_count / count,
+                "median_performance": float(np.median(scores)),
+                "performance_std": float(np.std(scores, ddof=1)) if count > 1 else 0
+            }
         
         # Sort by average performance
         sorted_emotions = sorted(
@@ -223,82 +524,47 @@ class EngagementTracker:
         return {
             "best_emotion": sorted_emotions[0][0] if sorted_emotions else "neutral",
             "emotion_rankings": sorted_emotions,
+            # Sum of the ranked averages, which the optimizer normalizes weights by
+            "total_performance": math.fsum(stats["average_performance"] for stats in emotion_stats.values()),
             "emotion_stats": emotion_stats
         }
     
-    async def _analyze_time_patterns(self) -> Dict[str, Any]:
+    def _analyze_time_patterns(self, aggregates: TrendAggregates) -> Dict[str, Any]:
         """Analyze when posts perform best"""
-        time_performance = {}
-        
-        for clip_data in self.metrics_data.values():
-            posted_at = clip_data.get("posted_at")
-            if not posted_at:
-                continue
-            
-            try:
-                post_time = datetime.fromisoformat(posted_at.replace('Z', '+00:00'))
-                hour = post_time.hour
-                day_of_week = post_time.weekday()  # 0 = Monday
-                
-                performance_score = clip_data.get("performance_score", 0)
-                
-                # Hour analysis
-                if hour not in time_performance:
-                    time_performance[hour] = {"scores": [], "count": 0}
-                time_performance[hour]["scores"].append(performance_score)
-                time_performance[hour]["count"] += 1
-                
-            except Exception as e:
-                logger.warning(f"⚠️ Error parsing post time: {e}")
+        # Calculate hour averages with per-hour sums over the known hours
+        known = aggregates.hours >= 0
+        hours = aggregates.hours[known]
+        counts = np.bincount(hours, minlength=24)
+        totals = np.bincount(hours, weights=aggregates.scores[known], minlength=24)
         
-        # Calculate hour averages
         hour_averages = {}
-        for hour, data in time_performance.items():
-            if data["count"] > 0:
-                hour_averages[hour] = {
-                    "average_performance": statistics.mean(data["scores"]),
-                    "post_count": data["count"]
-                }
+        for hour in np.flatnonzero(counts):
+            hour_averages[int(hour)] = {
+                "average_performance": float(totals[hour] / counts[hour]),
+                "post_count": int(counts[hour])
+            }
         
-        # Find best hours
-        best_hours = sorted(
+        # Find best hours (only the top three are used, no full sort needed)
+        best_hours = heapq.nlargest(
+            3,
             hour_averages.items(),
-            key=lambda x: x[1]["average_performance"],
-            reverse=True
-        )[:3]
+            key=lambda x: x[1]["average_performance"]
+        )
         
         return {
             "best_hours": [hour for hour, _ in best_hours],
             "hour_performance": hour_averages,
             "recommendations": {
-                "optimal_posting_times": [f"{hour:02d}:00" for hour, _ in best_hours]
+                "optimal_posting_times": [HOUR_LABELS[hour] for hour, _ in best_hours]
             }
         }
     
-    async def _analyze_platform_performance(self) -> Dict[str, Any]:
+    def _analyze_platform_performance(self, aggregates: TrendAggregates) -> Dict[str, Any]:
         """Analyze performance across platforms"""
-        platform_stats = {}
-        
-        for clip_data in self.metrics_data.values():
-            platforms = clip_data.get("platforms", {})
-            performance_score = clip_data.get("performance_score", 0)
-            
-            for platform, result in platforms.items():
-                if result.get("success"):
-                    if platform not in platform_stats:
-                        platform_stats[platform] = {
-                            "successful_posts": 0,
-                            "total_performance": 0,
-                            "viral_count": 0,
-                            "scores": []
-                        }
-                    
-                    platform_stats[platform]["successful_posts"] += 1
-                    platform_stats[platform]["total_performance"] += performance_score
-                    platform_stats[platform]["scores"].append(performance_score)
-                    
-                    if clip_data.get("is_viral", False):
-                        platform_stats[platform]["viral_count"] += 1
+        platform_stats = {
+            platform: dict(stats)
+            for platform, stats in aggregates.platform_stats.items()
+        }
         
         # Calculate platform averages
         for platform, stats in platform_stats.items():
@@ -316,10 +582,12 @@ class EngagementTracker:
         return {
             "best_platform": sorted_platforms[0][0] if sorted_platforms else "unknown",
             "platform_rankings": sorted_platforms,
+            # Sum of the ranked averages, which the optimizer normalizes priorities by
+            "total_performance": math.fsum(stats.get("average_performance", 0) for stats in platform_stats.values()),
             "platform_stats": platform_stats
         }
     
-    async def _analyze_content_insights(self) -> Dict[str, Any]:
+    def _analyze_content_insights(self, aggregates: TrendAggregates) -> Dict[str, Any]:
         """Analyze content patterns that drive engagement"""
         insights = {
             "duration_analysis": {},
@@ -327,100 +595,310 @@ class EngagementTracker:
             "viral_characteristics": {}
         }
         
-        # Duration analysis
-        duration_groups = {
-            "short": (0, 30),
-            "medium": (30, 45), 
-            "long": (45, 65)
-        }
-        
+        # Duration analysis: label every clip with its group in one call
         duration_performance = {}
-        for group_name, (min_dur, max_dur) in duration_groups.items():
-            matching_clips = [
-                clip for clip in self.metrics_data.values()
-                if min_dur <= clip.get("duration", 0) < max_dur
-            ]
-            
-            if matching_clips:
-                scores = [clip.get("performance_score", 0) for clip in matching_clips]
+        labels = np.digitize(aggregates.durations, DURATION_EDGES)
+        for label, group_name in enumerate(DURATION_GROUPS, 1):
+            mask = labels == label
+            count = int(mask.sum())
+            if count:
                 duration_performance[group_name] = {
-                    "count": len(matching_clips),
-                    "average_performance": statistics.mean(scores),
-                    "viral_count": sum(1 for clip in matching_clips if clip.get("is_viral", False))
+                    "count": count,
+                    "average_performance": float(aggregates.scores[mask].mean()),
+                    "viral_count": int(aggregates.viral[mask].sum())
                 }
         
         insights["duration_analysis"] = duration_performance
         
         # Viral characteristics
-        viral_clips = [clip for clip in self.metrics_data.values() if clip.get("is_viral", False)]
-        if viral_clips:
-            viral_emotions = [clip.get("emotion") for clip in viral_clips]
-            viral_durations = [clip.get("duration", 0) for clip in viral_clips]
-            
+        viral_durations = aggregates.durations[aggregates.viral]
+        if viral_durations.size:
             insights["viral_characteristics"] = {
-                "count": len(viral_clips),
-                "common_emotions": list(set(viral_emotions)),
-                "average_duration": statistics.mean(viral_durations) if viral_durations else 0,
-                "median_duration": statistics.median(viral_durations) if viral_durations else 0
+                "count": int(viral_durations.size),
+                "common_emotions": [
+                    aggregates.emotions[code]
+                    for code in np.unique(aggregates.emotion_codes[aggregates.viral])
+                ],
+                "average_duration": float(viral_durations.mean()),
+                "median_duration": float(np.median(viral_durations))
             }
         
         return insights
     
-    async def _generate_recommendations(self) -> List[str]:
-        """Generate actionable recommendations based on analysis"""
+    def _generate_recommendations(self, aggregates: TrendAggregates,
+                                  emotion_trends: Dict[str, Any],
+                                  time_patterns: Dict[str, Any],
+                                  platform_performance: Dict[str, Any],
+                                  content_insights: Dict[str, Any]) -> List[str]:
+        """
+        Generate actionable recommendations based on analysis
+        
+        Args:
+            aggregates: Result of _scan_all
+            emotion_trends: Result of _analyze_emotion_trends
+            time_patterns: Result of _analyze_time_patterns
+            platform_performance: Result of _analyze_platform_performance
+            content_insights: Result of _analyze_content_insights
+        
+        Returns:
+            List of recommendation strings
+        """
         recommendations = []
         
         # Emotion recommendations
-        emotion_trends = await self._analyze_emotion_trends()
         best_emotion = emotion_trends.get("best_emotion")
         if best_emotion and best_emotion != "neutral":
             recommendations.append(f"Focus on {best_emotion} content - it performs {emotion_trends['emotion_stats'][best_emotion]['average_performance']:.1f}% better on average")
         
         # Time recommendations
-        time_patterns = await self._analyze_time_patterns()
         best_hours = time_patterns.get("best_hours", [])
         if best_hours:
-            recommendations.append(f"Post during optimal hours: {', '.join(f'{h:02d}:00' for h in best_hours[:3])}")
+            recommendations.append(f"Post during optimal hours: {', '.join(HOUR_LABELS[h] for h in best_hours[:3])}")
         
         # Platform recommendations
-        platform_performance = await self._analyze_platform_performance()
         best_platform = platform_performance.get("best_platform")
         if best_platform:
             recommendations.append(f"Prioritize {best_platform} - it shows the best engagement rates")
         
         # Content recommendations
-        viral_clips = [clip for clip in self.metrics_data.values() if clip.get("is_viral", False)]
-        if viral_clips:
-            avg_viral_duration = statistics.mean([clip.get("duration", 0) for clip in viral_clips])
-            recommendations.append(f"Target {avg_viral_duration:.0f}-second clips for viral potential")
+        viral_characteristics = content_insights.get("viral_characteristics", {})
+        viral_count = viral_characteristics.get("count", 0)
+        if viral_count:
+            recommendations.append(f"Target {viral_characteristics['average_duration']:.0f}-second clips for viral potential")
         
         # General recommendations
-        total_clips = len(self.metrics_data)
-        viral_count = len(viral_clips)
+        scores = aggregates.scores
+        total_clips = len(scores)
         
         if total_clips > 0:
             viral_rate = viral_count / total_clips
             if viral_rate < 0.1:
                 recommendations.append("Experiment with more hook-heavy titles and trending topics")
             
-            avg_performance = statistics.mean([clip.get("performance_score", 0) for clip in self.metrics_data.values()])
+            avg_performance = float(scores.mean())
             if avg_performance < 30:
                 recommendations.append("Focus on stronger emotional content and better timing")
         
         return recommendations
     
-    async def _save_metrics(self):
-        """Save metrics data to file"""
+    async def _save_metrics(self) -> bool:
+        """
+        Save metrics data to file
+        
+        Returns:
+            True if the snapshot was written
+        """
         try:
-            self.file_handler.save_json(self.metrics_data, self.metrics_file)
+            if self.compress_metrics:
+                # Compact JSON; zstd makes indentation pointless
+                payload = self.file_handler.dumps_json(self.metrics_data, indent=None)
+                return await asyncio.to_thread(self._write_compressed_snapshot, payload)
+            
+            if not await self._write_json_async(self.metrics_data, self.metrics_file):
+                return False
+            if ZSTD_AVAILABLE:
+                # Without zstandard an old compressed snapshot can't be read, so keep it
+                self.compressed_metrics_file.unlink(missing_ok=True)
+            return True
         except Exception as e:
             logger.error(f"❌ Error saving metrics: {e}")
+            return False
+    
+    def _latest_snapshot_file(self) -> Path:
+        """
+        Pick the snapshot to load
+        
+        Saving one snapshot variant removes the other, so normally only one
+        exists; if both do (e.g. compression was switched on and off without
+        zstandard installed) the newer one wins.
+        """
+        candidates = [path for path in (self.compressed_metrics_file, self.metrics_file) if path.exists()]
+        if not candidates:
+            return self.metrics_file
+        return max(candidates, key=lambda path: path.stat().st_mtime)
+    
+    def _write_compressed_snapshot(self, payload: bytes) -> bool:
+        """Compress and write the metrics snapshot, replacing any uncompressed one"""
+        payload = self.file_handler.compress_bytes(payload)
+        if not self.file_handler.write_bytes_atomic(payload, self.compressed_metrics_file):
+            return False
+        self.metrics_file.unlink(missing_ok=True)
+        return True
+    
+    async def _write_json_async(self, data: Any, file_path: Path) -> bool:
+        """
+        Save JSON without blocking the event loop
+        
+        Data is serialized on the loop, so it can't change mid-dump, then
+        written to a temp file and renamed into place on a worker thread.
+        """
+        payload = self.file_handler.dumps_json(data)
+        return await asyncio.to_thread(self.file_handler.write_bytes_atomic, payload, file_path)
+    
+    async def _append_metrics_log(self, record: Dict[str, Any]):
+        """Queue one change record for the metrics log (or database)"""
+        try:
+            if self.metrics_db is not None:
+                # Rows are built from the live entry at flush time
+                self._pending_records.append(record)
+            else:
+                self._pending_records.append(json.dumps(record, default=str) + "\n")
+            
+            # Started lazily, the tracker may be built outside a running loop
+            if self._flush_task is None or self._flush_task.done():
+                self._dirty = asyncio.Event()
+                self._flush_task = asyncio.create_task(self._flush_loop())
+            self._dirty.set()
+            
+        except Exception as e:
+            logger.error(f"❌ Error queueing metrics log record: {e}")
+    
+    async def _flush_loop(self):
+        """Write queued log records shortly after each burst of changes"""
+        while True:
+            await self._dirty.wait()
+            self._dirty.clear()
+            await asyncio.sleep(self.flush_delay)
+            await self._flush_pending()
+    
+    async def _flush_pending(self):
+        """Append all queued records in one write, compacting when the log grows"""
+        if not self._pending_records:
+            return
+        
+        lines, self._pending_records = self._pending_records, []
+        try:
+            if self.metrics_db is not None:
+                clip_rows, metric_rows = self._build_db_rows(lines)
+                await asyncio.to_thread(self.metrics_db.write_changes, clip_rows, metric_rows)
+                return
+            await asyncio.to_thread(self._write_log_lines, lines)
+        except Exception as e:
+            logger.error(f"❌ Error writing metrics log: {e}")
+            # Keep the records for the next flush
+            self._pending_records[:0] = lines
+            return
+        
+        self._log_records += len(lines)
+        if self._log_records >= self.compact_every:
+            await self._compact_metrics()
+    
+    def _build_db_rows(self, records: List[Dict[str, Any]]):
+        """Turn queued change records into clip and metric rows for the database"""
+        clip_ids = {}
+        metric_rows = []
+        
+        for record in records:
+            if record["op"] == "track":
+                clip_id = record["entry"]["clip_id"]
+            else:
+                clip_id = record["clip_id"]
+                metric_rows.extend(
+                    (clip_id, record["platform"], metric_type, value)
+                    for metric_type, value in record["metrics"].items()
+                    if metric_type in METRIC_TYPES
+                )
+            clip_ids[clip_id] = None
+        
+        # One row per clip carrying its current score and viral flag
+        clip_rows = [MetricsDB.clip_row(self.metrics_data[clip_id]) for clip_id in clip_ids]
+        return clip_rows, metric_rows
+    
+    def _write_log_lines(self, lines: List[str]):
+        """Append lines to the metrics log file"""
+        with open(self.metrics_log, 'a', encoding='utf-8') as f:
+            f.writelines(lines)
+    
+    async def _compact_metrics(self):
+        """Write a full metrics snapshot and truncate the change log"""
+        try:
+            if not await self._save_metrics():
+                # The log is still the only copy of these changes
+                logger.warning("⚠️ Metrics snapshot not written, keeping the change log")
+                return
+            # Replaying a record already in the snapshot is harmless, so a
+            # crash between the two steps loses nothing
+            self.metrics_log.write_text("", encoding='utf-8')
+            self._log_records = 0
+            logger.debug("🗜️ Compacted engagement metrics log")
+            
+        except Exception as e:
+            logger.error(f"❌ Error compacting metrics: {e}")
+    
+    def _replay_metrics_log(self) -> int:
+        """
+        Apply change records logged since the last snapshot
+        
+        Returns:
+            Number of records replayed
+        """
+        if not self.metrics_log.exists():
+            return 0
+        
+        replayed = 0
+        try:
+            with open(self.metrics_log, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Partial line from an interrupted write
+                        logger.warning("⚠️ Skipping unreadable metrics log record")
+                        continue
+                    
+                    if record.get("op") == "track":
+                        entry = record["entry"]
+                        if entry["clip_id"] not in self.metrics_data:
+                            self.metrics_data[entry["clip_id"]] = _intern_entry(entry)
+                    elif record.get("op") == "update" and record.get("clip_id") in self.metrics_data:
+                        self._apply_metrics(record["clip_id"], record["platform"], record["metrics"], record["ts"])
+                    replayed += 1
+            
+            if replayed:
+                logger.debug(f"📖 Replayed {replayed} metrics log records")
+                
+        except Exception as e:
+            logger.error(f"❌ Error replaying metrics log: {e}")
+        
+        return replayed
+    
+    def _flush_at_exit(self):
+        """Write queued records synchronously (atexit, when no event loop is left)"""
+        if not self._pending_records:
+            return
+        
+        lines, self._pending_records = self._pending_records, []
+        try:
+            if self.metrics_db is not None:
+                clip_rows, metric_rows = self._build_db_rows(lines)
+                self.metrics_db.write_changes(clip_rows, metric_rows)
+            else:
+                self._write_log_lines(lines)
+            logger.debug(f"💾 Wrote {len(lines)} queued metrics records at exit")
+        except Exception as e:
+            logger.error(f"❌ Error writing metrics log at exit: {e}")
+    
+    async def aclose(self):
+        """Flush queued records and fold the log into the snapshot (call on shutdown)"""
+        _OPEN_TRACKERS.discard(self)
+        
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        
+        await self._flush_pending()
+        if self._log_records:
+            await self._compact_metrics()
+        
+        if self.metrics_db is not None:
+            await asyncio.to_thread(self.metrics_db.close)
     
     async def get_performance_summary(self) -> Dict[str, Any]:
         """Get comprehensive performance summary"""
         try:
             total_clips = len(self.metrics_data)
-            viral_clips = [clip for clip in self.metrics_data.values() if clip.get("is_viral", False)]
+            viral_count = len(self._viral_ids)
             
             if total_clips == 0:
                 return {"error": "No performance data available"}
@@ -429,10 +907,10 @@ class EngagementTracker:
             
             summary = {
                 "total_clips": total_clips,
-                "viral_clips": len(viral_clips),
-                "viral_rate": len(viral_clips) / total_clips,
-                "average_performance": statistics.mean(all_scores),
-                "median_performance": statistics.median(all_scores),
+                "viral_clips": viral_count,
+                "viral_rate": viral_count / total_clips,
+                "average_performance": math.fsum(all_scores) / total_clips,
+                "median_performance": _median(all_scores),
                 "best_performing_clip": max(self.metrics_data.values(), key=lambda x: x.get("performance_score", 0)),
                 "recent_trends": await self.analyze_trends(),
                 "last_updated": datetime.now().isoformat()
@@ -3,11 +3,17 @@ Offline LLM analyzer for intelligent content analysis
 """
 
 import asyncio
+import heapq
 import json
+import os
+import platform
+import random
 import re
-from typing import Dict, Any, List, Optional
+import threading
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
+import numpy as np
 from loguru import logger
 
 try:
@@ -17,7 +23,238 @@ except ImportError:
     GPT4ALL_AVAILABLE = False
     logger.warning("⚠️ GPT4All not available. Install with: pip install gpt4all")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.debug("orjson not available, using the standard json module. Install with: pip install orjson")
+
 from ..utils.config import Config
+from .semantic_cache import SemanticCache, make_cache_key
+
+# Analysis prompts start with these static instructions and end with the
+# per-call video context and transcript, so every prompt shares the same
+# prefix and backends that reuse a matching prompt prefix only process the
+# variable tail
+ANALYSIS_INSTRUCTIONS = """You are an expert content analyst specializing in identifying viral moments for short-form video content (TikTok, YouTube Shorts, Instagram Reels).
+
+Analyze the video transcript given at the end and identify the most engaging 30-60 second segments that would perform well as viral short-form content.
+
+For each viral moment you identify, provide:
+1. A compelling hook/title (5-8 words)
+2. Why it would be viral (emotional impact, relatability, shock value, etc.)
+3. Target emotion (funny, shocking, inspirational, educational, controversial)
+4. Engagement score (0.0 to 1.0)
+5. Key quotes or phrases
+
+Look for:
+- Surprising facts or revelations
+- Emotional moments (funny, shocking, inspiring)
+- Relatable experiences
+- Strong opinions or controversial takes
+- Educational insights or "aha" moments
+- Personal stories with universal appeal
+- Moments with natural hooks ("You won't believe...", "The secret is...", etc.)
+
+Only identify segments with high viral potential. Quality over quantity."""
+
+HIGHLIGHT_JSON_EXAMPLE = """{
+      "title": "Hook title here",
+      "reason": "Why this would be viral",
+      "emotion": "funny/shocking/inspirational/educational/controversial",
+      "engagement_score": 0.8,
+      "key_quotes": ["quote 1", "quote 2"],
+      "viral_potential": "high/medium/low"
+    }"""
+
+SINGLE_CHUNK_FORMAT = """Format your response as JSON:
+{
+  "highlights": [
+    """ + HIGHLIGHT_JSON_EXAMPLE + """
+  ]
+}"""
+
+BATCHED_CHUNK_FORMAT = """The transcript is split into numbered chunks. Analyze each chunk separately.
+
+Format your response as JSON with one entry per chunk id (use an empty list for chunks without viral moments):
+{
+  "chunks": [
+    {
+      "id": 0,
+      "highlights": [
+        """ + HIGHLIGHT_JSON_EXAMPLE.replace("\n", "\n    ") + """
+      ]
+    }
+  ]
+}"""
+
+# Prompts end with the opening of the expected JSON so generation starts
+# inside the object instead of with prose or a restated example
+SINGLE_CHUNK_PREFILL = '{"highlights": ['
+BATCHED_CHUNK_PREFILL = '{"chunks": ['
+
+# Allowed values of the highlight fields
+HIGHLIGHT_EMOTIONS = ('funny', 'shocking', 'inspirational', 'educational', 'controversial')
+VIRAL_POTENTIALS = ('high', 'medium', 'low')
+
+# "TITLE: ..." line in title generation responses
+_TITLE_RE = re.compile(r'TITLE:\s*(.+)')
+
+# Highlight ranking multipliers; emotions and potentials not listed get 1.0
+EMOTION_BOOST = {
+    'funny': 1.2,
+    'shocking': 1.1,
+    'inspirational': 1.0,
+    'controversial': 1.1,
+    'educational': 0.9
+}
+VIRAL_POTENTIAL_BOOST = {'high': 1.3, 'medium': 1.0, 'low': 0.8}
+
+# Keywords scored by the rule-based fallback analysis
+FALLBACK_EMOTION_KEYWORDS = {
+    'shocking': ('unbelievable', 'incredible', 'amazing', 'wow', 'surprised'),
+    'funny': ('funny', 'hilarious', 'laugh', 'joke', 'comedy'),
+    'inspirational': ('inspiring', 'motivational', 'success', 'achievement')
+}
+FALLBACK_SUPERLATIVES = ('best', 'worst', 'biggest', 'smallest', 'most', 'least')
+FALLBACK_PRONOUNS = ('i ', 'my ', 'me ')
+
+# keyword -> emotion, or "_superlative" / "_pronoun"
+_KEYWORD_CATEGORIES = {
+    **{keyword: emotion for emotion, keywords in FALLBACK_EMOTION_KEYWORDS.items() for keyword in keywords},
+    **{keyword: '_superlative' for keyword in FALLBACK_SUPERLATIVES},
+    **{keyword: '_pronoun' for keyword in FALLBACK_PRONOUNS}
+}
+
+# One alternation over every keyword; the lookahead makes finditer report
+# matches at every position, so overlapping keywords are all found just
+# like separate substring checks
+_KEYWORD_RE = re.compile(
+    '(?=(' + '|'.join(re.escape(keyword) for keyword in sorted(_KEYWORD_CATEGORIES, key=len, reverse=True)) + '))'
+)
+
+
+# Titles used when the LLM can't generate one, by emotion
+TITLE_TEMPLATES = {
+    'funny': ("This Will Make You Laugh", "Comedy Gold Right Here", "You'll Crack Up"),
+    'shocking': ("You Won't Believe This", "This Is Unreal", "Mind = Blown"),
+    'inspirational': ("This Changed Everything", "Pure Motivation", "Life Lesson Alert"),
+    'educational': ("You Need To Know This", "Hidden Truth Revealed", "Mind-Blowing Fact"),
+    'controversial': ("Hot Take Alert", "Unpopular Opinion", "This Is Controversial")
+}
+
+
+# Bit positions of a 64-bit SimHash fingerprint
+_SIMHASH_BITS = np.arange(64, dtype=np.uint64)
+_SIMHASH_MASK = (1 << 64) - 1
+
+
+def _simhash(text: str) -> int:
+    """
+    64-bit SimHash fingerprint of text over word 3-grams
+    
+    Near-identical texts get fingerprints that differ in only a few bits.
+    Shingles are hashed with the built-in (per-process salted) hash, so
+    fingerprints are only comparable within one process.
+    """
+    words = text.lower().split()
+    shingles = [' '.join(words[index:index + 3]) for index in range(max(1, len(words) - 2))]
+    hashes = np.fromiter(
+        (hash(shingle) & _SIMHASH_MASK for shingle in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    
+    # A fingerprint bit is set when most shingle hashes have it set
+    bit_counts = ((hashes[:, None] >> _SIMHASH_BITS) & np.uint64(1)).sum(axis=0)
+    return sum(1 << int(bit) for bit in np.flatnonzero(2 * bit_counts > len(shingles)))
+
+
+# Rough characters-per-token ratio of English text for LLaMA-family tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def _estimate_tokens(text: str) -> int:
+    """Estimate how many tokens text takes up in a prompt"""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+class _BraceScanner:
+    """
+    Incremental brace-depth tracker for JSON text
+    
+    Tracks nesting depth across calls to feed and skips braces inside JSON
+    string literals, so the end of the outermost object can be found as
+    text arrives, one token at a time.
+    """
+    
+    def __init__(self):
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> int:
+        """
+        Scan more text
+        
+        Returns:
+            Index in text of the brace that closes the outermost object, or -1
+        """
+        depth = self.depth
+        in_string = self.in_string
+        escaped = self.escaped
+        closed_at = -1
+        
+        for index, char in enumerate(text):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == '{':
+                depth += 1
+            elif char == '}' and depth:
+                depth -= 1
+                if depth == 0:
+                    closed_at = index
+                    break
+        
+        self.depth = depth
+        self.in_string = in_string
+        self.escaped = escaped
+        return closed_at
+
+
+def _extract_json(text: str, start: int = 0) -> Optional[str]:
+    """
+    Return the first brace-balanced {...} block in text at or after start
+    
+    A single linear scan that tracks nesting depth and skips braces inside
+    JSON string literals, so trailing prose or a second JSON block after
+    the first one doesn't end up in the slice.
+    
+    Args:
+        text: LLM response
+        start: Index to start searching from
+        
+    Returns:
+        The JSON object text, or None if no balanced block is found
+    """
+    begin = text.find('{', start)
+    if begin == -1:
+        return None
+    
+    end = _BraceScanner().feed(text[begin:])
+    return text[begin:begin + end + 1] if end != -1 else None
+
+
+# Model handle pools shared by every analyzer with the same model settings,
+# so the weights are only loaded once per process
+_SHARED_MODELS: Dict[Tuple, Tuple[Any, asyncio.Queue]] = {}
+_SHARED_MODELS_LOCK = threading.Lock()
 
 
 class LLMAnalyzer:
@@ -30,40 +267,170 @@ class LLMAnalyzer:
         self.llm_config = self.ai_config.get("llm", {})
         
         self.model = None
+        self._model_pool = None
+        self.model_name = self.llm_config.get("model", "mistral-7b-instruct-v0.1.q4_0.gguf")
         self.model_path = Path("./models")
-        self.model_path.mkdir(exist_ok=True)
+        if not self.model_path.exists():
+            self.model_path.mkdir(parents=True)
         
-        # Initialize model if available
+        # Responses for similar chunks are reused across runs
+        self.semantic_cache = None
+        
+        # Loading the model takes seconds, so it runs on a worker thread:
+        # started right away when constructed inside the event loop, so it
+        # overlaps with other startup work, otherwise on first use
+        self._init_task = None
         if GPT4ALL_AVAILABLE:
-            self._initialize_model()
+            try:
+                self._init_task = asyncio.get_running_loop().create_task(asyncio.to_thread(self._load))
+            except RuntimeError:
+                pass
         else:
             logger.warning("⚠️ LLM analysis will use fallback rule-based methods")
+        
+        # Changing the model, sampling settings or prompt template invalidates cached responses
+        self._cache_key = make_cache_key(
+            self.model_name,
+            self.llm_config.get("max_tokens", 500),
+            self.llm_config.get("temperature", 0.7),
+            self._create_analysis_prompt("", {})
+        )
+    
+    async def _ensure_loaded(self):
+        """Wait for the model (and semantic cache) to finish loading"""
+        if self._init_task is None:
+            if not GPT4ALL_AVAILABLE:
+                return
+            self._init_task = asyncio.ensure_future(asyncio.to_thread(self._load))
+        await self._init_task
+    
+    def _load(self):
+        """Load the model and the semantic cache (blocking)"""
+        self._initialize_model()
+        
+        cache_config = self.llm_config.get("semantic_cache", {})
+        if self.model and cache_config.get("enabled", True):
+            self.semantic_cache = SemanticCache(
+                db_path=self.model_path / "llm_cache.db",
+                model_name=cache_config.get("model", "all-MiniLM-L6-v2"),
+                threshold=cache_config.get("threshold", 0.93)
+            )
     
     def _initialize_model(self):
         """Initialize the offline LLM model"""
         try:
-            model_name = self.llm_config.get("model", "mistral-7b-instruct-v0.1.q4_0.gguf")
+            model_name = self.model_name
             
-            # Check if model exists locally
-            model_file = self.model_path / model_name
+            # A GPT4All handle can't run two generations at once, so each
+            # parallel chunk analysis gets its own handle from the pool
+            max_parallel = max(1, self.llm_config.get("max_parallel", 1))
             
-            if not model_file.exists():
-                logger.info(f"📥 Downloading LLM model: {model_name}")
-                # GPT4All will download automatically
+            # Decoding is memory-bandwidth bound, so use every core but split
+            # them between handles instead of oversubscribing
+            n_threads = self.llm_config.get("n_threads") or max(1, (os.cpu_count() or 4) // max_parallel)
             
-            self.model = GPT4All(
-                model_name=model_name,
-                model_path=str(self.model_path),
-                allow_download=True,
-                n_threads=4
+            shared_key = (
+                model_name, os.fspath(self.model_path), max_parallel, n_threads,
+                self.llm_config.get("device", "auto"),
+                self.llm_config.get("context_window", 4096),
+                self.llm_config.get("n_gpu_layers", 100)
             )
             
-            logger.success(f"✅ LLM model loaded: {model_name}")
+            with _SHARED_MODELS_LOCK:
+                shared = _SHARED_MODELS.get(shared_key)
+                if shared is None:
+                    # Check if model exists locally
+                    model_file = self.model_path / model_name
+                    
+                    if not model_file.exists():
+                        logger.info(f"📥 Downloading LLM model: {model_name}")
+                        # GPT4All will download automatically
+                    
+                    device = self._detect_device()
+                    
+                    try:
+                        handles = self._load_handles(model_name, max_parallel, n_threads, device)
+                    except Exception as e:
+                        if device == "cpu":
+                            raise
+                        # Out of GPU memory or no usable GPU backend
+                        logger.warning(f"⚠️ Could not load LLM on {device}, falling back to CPU: {e}")
+                        device = "cpu"
+                        handles = self._load_handles(model_name, max_parallel, n_threads, device)
+                    
+                    pool = asyncio.Queue()
+                    for handle in handles:
+                        pool.put_nowait(handle)
+                    shared = _SHARED_MODELS[shared_key] = (handles[0], pool)
+                    
+                    offload = "CPU only" if device == "cpu" else (
+                        f"{self.llm_config.get('n_gpu_layers', 100)} layers on {device}"
+                    )
+                    logger.success(
+                        f"✅ LLM model loaded: {model_name} (x{max_parallel}, {n_threads} threads each, {offload})"
+                    )
+            
+            self.model, self._model_pool = shared
             
         except Exception as e:
             logger.error(f"❌ Failed to initialize LLM model: {e}")
             self.model = None
     
+    def _detect_device(self) -> Optional[str]:
+        """
+        Pick the GPT4All device for decoding
+        
+        Decoding is memory-bandwidth bound, so offloading layers to a GPU is
+        much faster than CPU threads when one is available.
+        
+        Returns:
+            GPT4All device name, or None to let GPT4All use Metal on Apple Silicon
+        """
+        device = self.llm_config.get("device", "auto")
+        if device != "auto":
+            return device
+        
+        try:
+            import torch
+            if torch.cuda.is_available():
+                return "cuda"
+        except ImportError:
+            pass
+        
+        if platform.system() == "Darwin" and platform.machine() == "arm64":
+            return None
+        
+        return "cpu"
+    
+    def _load_handles(self, model_name: str, count: int, n_threads: int,
+                      device: Optional[str]) -> List[Any]:
+        """
+        Load count GPT4All handles for the model on the given device
+        
+        Handles load one at a time; if one fails, those already loaded are
+        closed so a retry on another device doesn't keep them in VRAM.
+        """
+        handles = []
+        try:
+            for _ in range(count):
+                handles.append(GPT4All(
+                    model_name=model_name,
+                    model_path=os.fspath(self.model_path),
+                    allow_download=True,
+                    n_threads=n_threads,
+                    device=device,
+                    n_ctx=self.llm_config.get("context_window", 4096),
+                    ngl=self.llm_config.get("n_gpu_layers", 100)
+                ))
+        except Exception:
+            for handle in handles:
+                try:
+                    handle.close()
+                except Exception as e:
+                    logger.debug(f"⚠️ Could not close LLM handle: {e}")
+            raise
+        return handles
+    
     async def analyze_content(self, full_transcript: str, segments: List[Dict[str, Any]], 
                             video_metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -77,6 +444,10 @@ class LLMAnalyzer:
         Returns:
             List of LLM-identified highlights
         """
+        await self._ensure_loaded()
+        
+        self._prepare_segments(segments)
+        
         if not self.model:
             logger.warning("⚠️ LLM not available, using fallback analysis")
             return await self._fallback_analysis(full_transcript, segments)
@@ -85,12 +456,43 @@ class LLMAnalyzer:
             logger.info("🤖 Running LLM content analysis...")
             
             # Split transcript into analyzable chunks
-            chunks = self._split_transcript(full_transcript, segments)
+            chunks = self._split_transcript(
+                full_transcript, segments, self._chunk_token_budget(video_metadata)
+            )
             
-            highlights = []
+            # Chunks the cheap rule-based scorer clearly rejects or accepts
+            # skip the LLM; only the ambiguous middle is worth its cost
+            skip_below = self.llm_config.get("cheap_skip_below", 0.15)
+            accept_above = self.llm_config.get("cheap_accept_above", 0.7)
             
+            highlights = []
+            llm_chunks = []
             for chunk in chunks:
-                chunk_highlights = await self._analyze_chunk(chunk, video_metadata)
+                score = self._score_chunk_cheap(chunk)
+                if score < skip_below:
+                    continue
+                if score > accept_above:
+                    highlights.extend(self._cheap_highlights(chunk))
+                else:
+                    llm_chunks.append(chunk)
+            
+            logger.debug(
+                f"🔍 Cheap pre-filter: {len(llm_chunks)}/{len(chunks)} chunks sent to the LLM, "
+                f"{len(highlights)} highlights accepted directly"
+            )
+            
+            # Near-duplicate chunks (repeated intros, recaps) reuse the
+            # response of the first one instead of getting their own
+            llm_chunks = self._dedupe_chunks(llm_chunks)
+            
+            # Several chunks share one prompt; batches are analyzed
+            # concurrently, bounded by the model pool size
+            chunk_results = await asyncio.gather(*[
+                self._analyze_batch(batch, video_metadata)
+                for batch in self._batch_chunks(llm_chunks, video_metadata)
+            ])
+            
+            for chunk_highlights in chunk_results:
                 highlights.extend(chunk_highlights)
             
             # Rank and filter highlights
@@ -103,140 +505,401 @@ class LLMAnalyzer:
             logger.error(f"❌ Error in LLM analysis: {e}")
             return await self._fallback_analysis(full_transcript, segments)
     
-    def _split_transcript(self, transcript: str, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Split transcript into analyzable chunks"""
+    def _prepare_segments(self, segments: List[Dict[str, Any]]):
+        """
+        Store each segment's lowercased text ('_lower') and word set ('_words')
+        on the segment, so keyword scoring and quote matching don't redo it
+        for every chunk, highlight and quote
+        """
+        for segment in segments:
+            if '_lower' not in segment:
+                segment['_lower'] = segment['text'].lower()
+                segment['_words'] = frozenset(segment['_lower'].split())
+    
+    def _dedupe_chunks(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drop chunks whose text is a near-duplicate of an earlier chunk
+        
+        Chunks count as near-duplicates when their SimHash fingerprints differ
+        in at most near_duplicate_bits bits. Each dropped chunk is listed under
+        '_duplicates' of the chunk it repeats, so that chunk's LLM highlights
+        are also matched against the duplicate's own segments.
+        
+        Args:
+            chunks: Chunks about to be sent to the LLM
+            
+        Returns:
+            Chunks that still need an LLM response
+        """
+        max_distance = self.llm_config.get("near_duplicate_bits", 3)
+        if max_distance < 0:
+            return chunks
+        
+        unique_chunks = []
+        fingerprints = []
+        
+        for chunk in chunks:
+            fingerprint = _simhash(chunk['text'])
+            original = next(
+                (
+                    unique_chunk for unique_chunk, other in zip(unique_chunks, fingerprints)
+                    if (fingerprint ^ other).bit_count() <= max_distance
+                ),
+                None
+            )
+            
+            if original is None:
+                unique_chunks.append(chunk)
+                fingerprints.append(fingerprint)
+            else:
+                original.setdefault('_duplicates', []).append(chunk)
+        
+        if len(unique_chunks) < len(chunks):
+            logger.debug(f"🔁 Skipping LLM for {len(chunks) - len(unique_chunks)} near-duplicate chunks")
+        
+        return unique_chunks
+    
+    def _chunk_token_budget(self, video_metadata: Dict[str, Any]) -> int:
+        """
+        Transcript tokens per chunk so that a full batch of chunks, the prompt
+        instructions and each chunk's response all fit in the context window
+        """
+        batch_size = max(1, self.llm_config.get("chunks_per_prompt", 3))
+        context_window = self.llm_config.get("context_window", 4096)
+        max_tokens = self.llm_config.get("max_tokens", 500)
+        prompt_tokens = _estimate_tokens(self._create_batched_prompt([], video_metadata))
+        
+        budget = (context_window - prompt_tokens) // batch_size - max_tokens
+        
+        # Never go below the old 1000-character chunks
+        return max(budget, 1000 // CHARS_PER_TOKEN)
+    
+    def _split_transcript(self, transcript: str, segments: List[Dict[str, Any]],
+                          max_chunk_tokens: int = 250) -> List[Dict[str, Any]]:
+        """
+        Split transcript into analyzable chunks
+        
+        Args:
+            transcript: Complete video transcript
+            segments: Transcript segments with timestamps
+            max_chunk_tokens: Estimated token size limit of a chunk's text
+            
+        Returns:
+            List of chunks with text, segments and time range
+        """
         chunks = []
-        chunk_size = 1000  # Characters per chunk
+        chunk_size = max_chunk_tokens * CHARS_PER_TOKEN  # Characters per chunk
         overlap = 200      # Overlap between chunks
         
-        # Group segments into chunks
-        current_chunk = {
-            'text': '',
-            'segments': [],
-            'start_time': 0,
-            'end_time': 0
-        }
+        # Current chunk, its text kept as pieces and joined once when finalized
+        parts = []
+        text_length = 0
+        chunk_segments = []
+        start_time = 0
         
         for segment in segments:
             segment_text = segment['text']
             
             # Check if adding this segment would exceed chunk size
-            if len(current_chunk['text'] + segment_text) > chunk_size and current_chunk['text']:
+            if text_length + len(segment_text) > chunk_size and text_length:
                 # Finalize current chunk
-                current_chunk['end_time'] = current_chunk['segments'][-1]['end'] if current_chunk['segments'] else 0
-                chunks.append(current_chunk.copy())
+                text = ''.join(parts)
+                chunks.append({
+                    'text': text,
+                    'segments': chunk_segments,
+                    'start_time': start_time,
+                    'end_time': chunk_segments[-1]['end'] if chunk_segments else 0
+                })
                 
                 # Start new chunk with overlap
-                overlap_text = current_chunk['text'][-overlap:] if len(current_chunk['text']) > overlap else current_chunk['text']
-                current_chunk = {
-                    'text': overlap_text + ' ' + segment_text,
-                    'segments': [segment],
-                    'start_time': segment['start'],
-                    'end_time': segment['end']
-                }
+                overlap_text = text[-overlap:]
+                parts = [overlap_text, ' ', segment_text]
+                text_length = len(overlap_text) + 1 + len(segment_text)
+                chunk_segments = [segment]
+                start_time = segment['start']
             else:
                 # Add to current chunk
-                if not current_chunk['segments']:
-                    current_chunk['start_time'] = segment['start']
+                if not chunk_segments:
+                    start_time = segment['start']
                 
-                current_chunk['text'] += ' ' + segment_text
-                current_chunk['segments'].append(segment)
-                current_chunk['end_time'] = segment['end']
+                parts.append(' ')
+                parts.append(segment_text)
+                text_length += 1 + len(segment_text)
+                chunk_segments.append(segment)
         
         # Add final chunk
-        if current_chunk['text']:
-            chunks.append(current_chunk)
+        if text_length:
+            chunks.append({
+                'text': ''.join(parts),
+                'segments': chunk_segments,
+                'start_time': start_time,
+                'end_time': chunk_segments[-1]['end']
+            })
         
         return chunks
     
-    async def _analyze_chunk(self, chunk: Dict[str, Any], video_metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Analyze a single chunk with LLM"""
+    def _batch_chunks(self, chunks: List[Dict[str, Any]],
+                      video_metadata: Dict[str, Any]) -> List[List[Dict[str, Any]]]:
+        """
+        Group chunks so each batch fits one prompt within the context window
+        
+        Token counts are estimated from text length (CHARS_PER_TOKEN).
+        """
+        batch_size = max(1, self.llm_config.get("chunks_per_prompt", 3))
+        context_window = self.llm_config.get("context_window", 4096)
+        max_tokens = self.llm_config.get("max_tokens", 500)
+        prompt_tokens = _estimate_tokens(self._create_batched_prompt([], video_metadata))
+        
+        batches = []
+        batch = []
+        batch_tokens = prompt_tokens
+        
+        for chunk in chunks:
+            chunk_tokens = _estimate_tokens(chunk['text']) + max_tokens
+            if batch and (len(batch) >= batch_size or batch_tokens + chunk_tokens > context_window):
+                batches.append(batch)
+                batch = []
+                batch_tokens = prompt_tokens
+            batch.append(chunk)
+            batch_tokens += chunk_tokens
+        
+        if batch:
+            batches.append(batch)
+        
+        return batches
+    
+    async def _analyze_batch(self, batch: List[Dict[str, Any]], video_metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Analyze a batch of chunks with a single LLM generation"""
         try:
-            # Prepare prompt for LLM
-            prompt = self._create_analysis_prompt(chunk['text'], video_metadata)
-            
-            # Generate response
-            response = self.model.generate(
-                prompt,
-                max_tokens=self.llm_config.get("max_tokens", 500),
-                temp=self.llm_config.get("temperature", 0.7),
-                streaming=False
-            )
+            # Raw LLM highlights per chunk, None until known
+            chunk_highlights = [None] * len(batch)
+            embeddings = [None] * len(batch)
             
-            # Parse LLM response
-            highlights = self._parse_llm_response(response, chunk)
+            # Reuse the responses of earlier, similar chunks where there are some
+            if self.semantic_cache is not None and self.semantic_cache.enabled:
+                for index, chunk in enumerate(batch):
+                    embeddings[index] = await asyncio.to_thread(self.semantic_cache.encode, chunk['text'])
+                    cached = await asyncio.to_thread(self.semantic_cache.lookup, embeddings[index], self._cache_key)
+                    if cached is not None:
+                        chunk_highlights[index] = self._parse_llm_response(cached).get('highlights', [])
             
-            return highlights
+            pending = [index for index, highlights in enumerate(chunk_highlights) if highlights is None]
+            if pending:
+                max_tokens = self.llm_config.get("max_tokens", 500)
+                
+                if len(pending) == 1:
+                    prompt = self._create_analysis_prompt(batch[pending[0]]['text'], video_metadata)
+                    prefill = SINGLE_CHUNK_PREFILL
+                else:
+                    prompt = self._create_batched_prompt([batch[index] for index in pending], video_metadata)
+                    prefill = BATCHED_CHUNK_PREFILL
+                
+                # Generate response, stopping once the JSON object is closed
+                # instead of spending tokens on trailing prose
+                response = await self._generate(
+                    prompt,
+                    stop=self._json_stop(prefill),
+                    max_tokens=max_tokens * len(pending),
+                    temp=self.llm_config.get("temperature", 0.7),
+                    streaming=False
+                )
+                
+                # Parse LLM response and hand each chunk its highlights
+                data = self._parse_llm_response(response, prefill)
+                if len(pending) == 1:
+                    results = [data.get('highlights', [])]
+                else:
+                    by_id = {
+                        item.get('id'): item.get('highlights', [])
+                        for item in data.get('chunks', []) if isinstance(item, dict)
+                    }
+                    results = [by_id.get(chunk_id, []) for chunk_id in range(len(pending))]
+                
+                for index, highlights in zip(pending, results):
+                    chunk_highlights[index] = highlights
+                    if embeddings[index] is not None and data:
+                        await asyncio.to_thread(
+                            self.semantic_cache.store, embeddings[index], self._cache_key,
+                            json.dumps({"highlights": highlights})
+                        )
+            
+            converted_highlights = []
+            for chunk, highlights in zip(batch, chunk_highlights):
+                for target in [chunk, *chunk.get('_duplicates', ())]:
+                    converted_highlights.extend(self._convert_highlights(highlights, target))
+            
+            return converted_highlights
             
         except Exception as e:
-            logger.warning(f"⚠️ Error analyzing chunk: {e}")
+            logger.warning(f"⚠️ Error analyzing chunk batch: {e}")
             return []
     
-    def _create_analysis_prompt(self, text: str, video_metadata: Dict[str, Any]) -> str:
-        """Create prompt for LLM analysis"""
+    async def _generate(self, prompt: str, stop: Optional[Callable[[str], bool]] = None, **kwargs) -> str:
+        """
+        Run a generation on a free model handle without blocking the event loop
+        
+        Args:
+            prompt: Prompt text
+            stop: Called with each generated token; generation ends after the
+                token for which it returns True, instead of running to max_tokens
+            **kwargs: Passed through to GPT4All.generate
+            
+        Returns:
+            Generated text
+        """
+        if stop is not None:
+            # GPT4All keeps generating while the callback returns True
+            kwargs['callback'] = lambda token_id, token: not stop(token)
+        
+        model = await self._model_pool.get()
+        try:
+            return await asyncio.to_thread(model.generate, prompt, **kwargs)
+        finally:
+            self._model_pool.put_nowait(model)
+    
+    @staticmethod
+    def _json_stop(prefill: str) -> Callable[[str], bool]:
+        """Stop condition for a response continuing prefill: the outermost JSON object is closed"""
+        scanner = _BraceScanner()
+        scanner.feed(prefill)
+        return lambda token: scanner.feed(token) != -1
+    
+    @staticmethod
+    def _title_stop() -> Callable[[str], bool]:
+        """Stop condition for title generation: the line after "TITLE:" has ended"""
+        pieces = []
+        
+        def stop(token: str) -> bool:
+            pieces.append(token)
+            if '\n' not in token:
+                return False
+            text = ''.join(pieces)
+            title_at = text.find('TITLE:')
+            return title_at != -1 and text.find('\n', title_at) != -1
+        
+        return stop
+    
+    def _create_video_context(self, video_metadata: Dict[str, Any]) -> str:
+        """Video title and description lines for analysis prompts"""
         video_context = f"Video Title: {video_metadata.get('title', 'Unknown')}\n"
         if video_metadata.get('description'):
             video_context += f"Description: {video_metadata['description'][:200]}...\n"
+        return video_context
+    
+    def _create_analysis_prompt(self, text: str, video_metadata: Dict[str, Any]) -> str:
+        """Create prompt for LLM analysis"""
+        video_context = self._create_video_context(video_metadata)
         
-        prompt = f"""You are an expert content analyst specializing in identifying viral moments for short-form video content (TikTok, YouTube Shorts, Instagram Reels).
+        prompt = f"""{ANALYSIS_INSTRUCTIONS}
 
-{video_context}
-
-Analyze the following transcript and identify the most engaging 30-60 second segments that would perform well as viral short-form content.
+{SINGLE_CHUNK_FORMAT}
 
+{video_context}
 Transcript:
 {text}
 
-For each viral moment you identify, provide:
-1. A compelling hook/title (5-8 words)
-2. Why it would be viral (emotional impact, relatability, shock value, etc.)
-3. Target emotion (funny, shocking, inspirational, educational, controversial)
-4. Engagement score (0.0 to 1.0)
-5. Key quotes or phrases
+JSON response:
+{SINGLE_CHUNK_PREFILL}"""
+        
+        return prompt
+    
+    def _create_batched_prompt(self, chunks: List[Dict[str, Any]], video_metadata: Dict[str, Any]) -> str:
+        """Create one prompt that asks for highlights of several chunks, keyed by chunk id"""
+        video_context = self._create_video_context(video_metadata)
+        
+        sections = "\n\n".join(
+            f"### CHUNK {chunk_id}\n{chunk['text']}" for chunk_id, chunk in enumerate(chunks)
+        )
+        
+        prompt = f"""{ANALYSIS_INSTRUCTIONS}
 
-Look for:
-- Surprising facts or revelations
-- Emotional moments (funny, shocking, inspiring)
-- Relatable experiences
-- Strong opinions or controversial takes
-- Educational insights or "aha" moments
-- Personal stories with universal appeal
-- Moments with natural hooks ("You won't believe...", "The secret is...", etc.)
+{BATCHED_CHUNK_FORMAT}
 
-Format your response as JSON:
-{{
-  "highlights": [
-    {{
-      "title": "Hook title here",
-      "reason": "Why this would be viral",
-      "emotion": "funny/shocking/inspirational/educational/controversial",
-      "engagement_score": 0.8,
-      "key_quotes": ["quote 1", "quote 2"],
-      "viral_potential": "high/medium/low"
-    }}
-  ]
-}}
+{video_context}
+Transcript ({len(chunks)} chunks):
 
-Only identify segments with high viral potential. Quality over quantity."""
+{sections}
+
+JSON response:
+{BATCHED_CHUNK_PREFILL}"""
         
         return prompt
     
-    def _parse_llm_response(self, response: str, chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Parse LLM response and extract highlights"""
-        try:
-            # Try to extract JSON from response
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if not json_match:
-                logger.warning("⚠️ No JSON found in LLM response")
-                return []
-            
-            data = json.loads(json_match.group())
-            highlights = data.get('highlights', [])
+    def _parse_llm_response(self, response: str, prefill: str = "") -> Dict[str, Any]:
+        """
+        Extract the JSON object from an LLM response
+        
+        Args:
+            response: Generated text
+            prefill: JSON opening the prompt ended with; the response continues it,
+                unless the model started the object over
             
+        Returns:
+            Parsed object, or an empty dict if there is none
+        """
+        for text in ((prefill + response, response) if prefill else (response,)):
+            # Try each balanced {...} block until one parses, skipping prose like "{name}"
+            start = 0
+            while True:
+                json_text = _extract_json(text, start)
+                if json_text is None:
+                    break
+                
+                try:
+                    data = orjson.loads(json_text) if ORJSON_AVAILABLE else json.loads(json_text)
+                    if isinstance(data, dict):
+                        return data
+                except ValueError:
+                    pass
+                
+                start = text.index(json_text, start) + 1
+        
+        logger.warning("⚠️ No JSON found in LLM response")
+        return {}
+    
+    def _normalize_highlight(self, highlight: Any) -> Optional[Dict[str, Any]]:
+        """
+        Coerce an LLM highlight to the expected schema
+        
+        Returns:
+            The highlight with valid field types and values, or None if it isn't an object
+        """
+        if not isinstance(highlight, dict):
+            return None
+        
+        emotion = str(highlight.get('emotion', 'neutral')).strip().lower()
+        viral_potential = str(highlight.get('viral_potential', 'medium')).strip().lower()
+        
+        try:
+            engagement_score = min(1.0, max(0.0, float(highlight.get('engagement_score', 0.5))))
+        except (TypeError, ValueError):
+            engagement_score = 0.5
+        
+        key_quotes = highlight.get('key_quotes', [])
+        if isinstance(key_quotes, str):
+            key_quotes = [key_quotes]
+        elif not isinstance(key_quotes, list):
+            key_quotes = []
+        
+        return {
+            **highlight,
+            'emotion': emotion if emotion in HIGHLIGHT_EMOTIONS else 'neutral',
+            'viral_potential': viral_potential if viral_potential in VIRAL_POTENTIALS else 'medium',
+            'engagement_score': engagement_score,
+            'key_quotes': [str(quote) for quote in key_quotes if quote]
+        }
+    
+    def _convert_highlights(self, highlights: List[Dict[str, Any]], chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Convert LLM highlights of a chunk to the standard highlight format"""
+        try:
             # Convert to standard format
             converted_highlights = []
             
             for highlight in highlights:
+                highlight = self._normalize_highlight(highlight)
+                if highlight is None:
+                    continue
+                
                 # Find best matching segment(s) based on key quotes
                 matching_segments = self._find_matching_segments(
                     highlight.get('key_quotes', []),
@@ -283,7 +946,7 @@ Only identify segments with high viral potential. Quality over quantity."""
             return converted_highlights
             
         except Exception as e:
-            logger.warning(f"⚠️ Error parsing LLM response: {e}")
+            logger.warning(f"⚠️ Error converting LLM highlights: {e}")
             return []
     
     def _find_matching_segments(self, key_quotes: List[str], segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -291,72 +954,58 @@ Only identify segments with high viral potential. Quality over quantity."""
         if not key_quotes:
             return segments[:3] if len(segments) >= 3 else segments  # Return first few segments as fallback
         
-        matching_segments = []
-        
+        # Segments containing a quote
+        matching_indices = set()
         for quote in key_quotes:
             quote_lower = quote.lower()
-            
-            for segment in segments:
-                segment_text = segment['text'].lower()
-                
-                # Check for quote match
-                if quote_lower in segment_text or any(word in segment_text for word in quote_lower.split()):
-                    if segment not in matching_segments:
-                        matching_segments.append(segment)
+            matching_indices.update(
+                index for index, segment in enumerate(segments) if quote_lower in segment['_lower']
+            )
+        
+        # If no quote is found verbatim, return the segments with the highest word overlap
+        if not matching_indices:
+            quote_words = frozenset(' '.join(key_quotes).lower().split())
+            overlaps = [len(quote_words & segment['_words']) for segment in segments]
+            matching_indices = {
+                index for index in heapq.nlargest(3, range(len(segments)), key=overlaps.__getitem__)
+                if overlaps[index]
+            }
         
         # Sort by timestamp
+        matching_segments = [segments[index] for index in matching_indices]
         matching_segments.sort(key=lambda x: x['start'])
         
-        # If no matches found, return segments with highest word overlap
-        if not matching_segments:
-            quote_words = set(' '.join(key_quotes).lower().split())
-            
-            segment_scores = []
-            for segment in segments:
-                segment_words = set(segment['text'].lower().split())
-                overlap = len(quote_words & segment_words)
-                segment_scores.append((segment, overlap))
-            
-            # Sort by overlap score
-            segment_scores.sort(key=lambda x: x[1], reverse=True)
-            matching_segments = [seg for seg, score in segment_scores[:3] if score > 0]
-        
         return matching_segments
     
     async def _rank_highlights(self, highlights: List[Dict[str, Any]], video_metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Rank highlights by viral potential"""
         try:
-            # Score highlights based on multiple factors
-            for highlight in highlights:
-                score = highlight.get('confidence', 0.5)
-                
-                # Boost based on viral potential
-                viral_potential = highlight.get('viral_potential', 'medium')
-                if viral_potential == 'high':
-                    score *= 1.3
-                elif viral_potential == 'low':
-                    score *= 0.8
-                
-                # Boost based on emotion
-                emotion = highlight.get('emotion', 'neutral')
-                emotion_boost = {
-                    'funny': 1.2,
-                    'shocking': 1.1,
-                    'inspirational': 1.0,
-                    'controversial': 1.1,
-                    'educational': 0.9
-                }.get(emotion, 1.0)
-                
-                score *= emotion_boost
-                
-                # Update confidence
-                highlight['confidence'] = min(score, 1.0)
+            if not highlights:
+                return []
             
-            # Sort by confidence and return top highlights
-            highlights.sort(key=lambda x: x.get('confidence', 0), reverse=True)
+            # Score highlights based on multiple factors, one column per factor
+            count = len(highlights)
+            confidence = np.fromiter(
+                (highlight.get('confidence', 0.5) for highlight in highlights), dtype=np.float64, count=count
+            )
+            viral_boost = np.fromiter(
+                (VIRAL_POTENTIAL_BOOST.get(highlight.get('viral_potential', 'medium'), 1.0) for highlight in highlights),
+                dtype=np.float64, count=count
+            )
+            emotion_boost = np.fromiter(
+                (EMOTION_BOOST.get(highlight.get('emotion', 'neutral'), 1.0) for highlight in highlights),
+                dtype=np.float64, count=count
+            )
+            scores = np.minimum(confidence * viral_boost * emotion_boost, 1.0)
             
-            # Return top 5 highlights
-            return highlights[:5]
+            # Update confidence
+            score_list = scores.tolist()
+            for highlight, score in zip(highlights, score_list):
+                highlight['confidence'] = score
+            
+            # Return top 5 highlights by confidence (ties keep their order, like a stable sort)
+            top = heapq.nlargest(5, range(count), key=score_list.__getitem__)
+            return [highlights[index] for index in top]
             
         except Exception as e:
             logger.warning(f"⚠️ Error ranking highlights: {e}")
@@ -366,65 +1015,108 @@ Only identify segments with high viral potential. Quality over quantity."""
         """Fallback analysis when LLM is not available"""
         logger.info("🔄 Using fallback rule-based analysis")
         
+        self._prepare_segments(segments)
+        
         # Simple rule-based highlight detection
         highlights = []
         
-        # Look for segments with emotional keywords
-        emotion_keywords = {
-            'shocking': ['unbelievable', 'incredible', 'amazing', 'wow', 'surprised'],
-            'funny': ['funny', 'hilarious', 'laugh', 'joke', 'comedy'],
-            'inspirational': ['inspiring', 'motivational', 'success', 'achievement']
-        }
-        
         for i, segment in enumerate(segments):
-            text_lower = segment['text'].lower()
-            score = 0
-            emotions = []
-            
-            # Check for emotional content
-            for emotion, keywords in emotion_keywords.items():
-                if any(keyword in text_lower for keyword in keywords):
-                    score += 0.3
-                    emotions.append(emotion)
-            
-            # Check for questions (often engaging)
-            if '?' in segment['text']:
-                score += 0.2
-            
-            # Check for first-person stories
-            if any(pronoun in text_lower for pronoun in ['i ', 'my ', 'me ']):
-                score += 0.1
-            
-            # Check for superlatives
-            superlatives = ['best', 'worst', 'biggest', 'smallest', 'most', 'least']
-            if any(sup in text_lower for sup in superlatives):
-                score += 0.2
+            score, emotions = self._score_segment_cheap(segment)
             
             if score >= 0.4:  # Threshold for highlight
-                # Extend to minimum duration
-                start_idx = max(0, i - 1)
-                end_idx = min(len(segments) - 1, i + 2)
-                
-                start_time = segments[start_idx]['start']
-                end_time = segments[end_idx]['end']
-                
-                combined_text = ' '.join([
-                    segments[j]['text'] for j in range(start_idx, end_idx + 1)
-                ])
-                
-                highlights.append({
-                    'start_time': start_time,
-                    'end_time': end_time,
-                    'text': combined_text,
-                    'confidence': score,
-                    'emotions': emotions,
-                    'emotion': emotions[0] if emotions else 'neutral'
+                highlights.append(self._fallback_highlight(segments, i, score, emotions))
+        
+        return heapq.nlargest(3, highlights, key=lambda highlight: highlight['confidence'])  # Return top 3
+    
+    def _score_segment_cheap(self, segment: Dict[str, Any]) -> Tuple[float, List[str]]:
+        """
+        Rule-based engagement score of a transcript segment
+        
+        Args:
+            segment: Segment prepared by _prepare_segments
+            
+        Returns:
+            Score and the emotions whose keywords appear in the text
+        """
+        score = 0
+        emotions = []
+        
+        # Every keyword category present in the segment, in one scan
+        hits = {_KEYWORD_CATEGORIES[match.group(1)] for match in _KEYWORD_RE.finditer(segment['_lower'])}
+        
+        # Check for emotional content
+        for emotion in FALLBACK_EMOTION_KEYWORDS:
+            if emotion in hits:
+                score += 0.3
+                emotions.append(emotion)
+        
+        # Check for questions (often engaging)
+        if '?' in segment['text']:
+            score += 0.2
+        
+        # Check for first-person stories
+        if '_pronoun' in hits:
+            score += 0.1
+        
+        # Check for superlatives
+        if '_superlative' in hits:
+            score += 0.2
+        
+        return score, emotions
+    
+    def _score_chunk_cheap(self, chunk: Dict[str, Any]) -> float:
+        """Rule-based score of a chunk: the score of its best segment, capped at 1.0"""
+        return min(1.0, max(
+            (self._score_segment_cheap(segment)[0] for segment in chunk['segments']),
+            default=0.0
+        ))
+    
+    def _fallback_highlight(self, segments: List[Dict[str, Any]], index: int,
+                            score: float, emotions: List[str]) -> Dict[str, Any]:
+        """Highlight around a segment picked by the rule-based scorer"""
+        # Extend to minimum duration
+        start_idx = max(0, index - 1)
+        end_idx = min(len(segments) - 1, index + 2)
+        
+        start_time = segments[start_idx]['start']
+        end_time = segments[end_idx]['end']
+        
+        combined_text = ' '.join([
+            segments[j]['text'] for j in range(start_idx, end_idx + 1)
+        ])
+        
+        return {
+            'start_time': start_time,
+            'end_time': end_time,
+            'text': combined_text,
+            'confidence': score,
+            'emotions': emotions,
+            'emotion': emotions[0] if emotions else 'neutral'
+        }
+    
+    def _cheap_highlights(self, chunk: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Highlights of a chunk the rule-based scorer accepts without the LLM"""
+        segments = chunk['segments']
+        highlights = []
+        
+        for i, segment in enumerate(segments):
+            score, emotions = self._score_segment_cheap(segment)
+            if score >= 0.4:
+                highlight = self._fallback_highlight(segments, i, min(score, 1.0), emotions)
+                highlight.update({
+                    'title': self._fallback_title_generation(highlight['text'], highlight['emotion']),
+                    'viral_potential': 'medium',
+                    'reason': 'Strong rule-based engagement signals',
+                    'key_quotes': []
                 })
+                highlights.append(highlight)
         
-        return highlights[:3]  # Return top 3
+        return highlights
     
     async def generate_title(self, text: str, emotion: str = 'neutral') -> str:
         """Generate a viral title using LLM"""
+        await self._ensure_loaded()
+        
         if not self.model:
             return self._fallback_title_generation(text, emotion)
         
@@ -450,10 +1142,10 @@ Examples of good viral titles:
 Generate 3 title options and pick the best one. Response format:
 TITLE: [your best title here]"""
 
-            response = self.model.generate(prompt, max_tokens=100, temp=0.8)
+            response = await self._generate(prompt, stop=self._title_stop(), max_tokens=100, temp=0.8)
             
             # Extract title from response
-            title_match = re.search(r'TITLE:\s*(.+)', response)
+            title_match = _TITLE_RE.search(response)
             if title_match:
                 return title_match.group(1).strip()
             
@@ -466,14 +1158,5 @@ TITLE: [your best title here]"""
     
     def _fallback_title_generation(self, text: str, emotion: str) -> str:
         """Fallback title generation without LLM"""
-        templates = {
-            'funny': ["This Will Make You Laugh", "Comedy Gold Right Here", "You'll Crack Up"],
-            'shocking': ["You Won't Believe This", "This Is Unreal", "Mind = Blown"],
-            'inspirational': ["This Changed Everything", "Pure Motivation", "Life Lesson Alert"],
-            'educational': ["You Need To Know This", "Hidden Truth Revealed", "Mind-Blowing Fact"],
-            'controversial': ["Hot Take Alert", "Unpopular Opinion", "This Is Controversial"]
-        }
-        
-        import random
-        emotion_templates = templates.get(emotion, templates['shocking'])
+        emotion_templates = TITLE_TEMPLATES.get(emotion, TITLE_TEMPLATES['shocking'])
         return random.choice(emotion_templates)
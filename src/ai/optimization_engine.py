@@ -3,15 +3,138 @@ Optimization engine for improving content performance based on analytics
 """
 
 import asyncio
+import math
+import time
+from operator import itemgetter
+from types import MappingProxyType
 from datetime import datetime, timedelta
+from pathlib import Path
 from typing import Dict, Any, List, Optional
 import json
-import statistics
 
+import numpy as np
 from loguru import logger
 
 from ..utils.config import Config
-from .engagement_tracker import EngagementTracker
+from ..utils.file_handler import FileHandler
+from .engagement_tracker import EngagementTracker, HOUR_LABELS
+
+
+# Clip duration limits (min, max seconds) for each duration group
+DURATION_RANGES = MappingProxyType({
+    "short": (25, 35),
+    "medium": (35, 50),
+    "long": (50, 65)
+})
+
+# Optimization weights for different factors, shared read-only by every engine
+OPTIMIZATION_WEIGHTS = MappingProxyType({
+    "emotion": 0.25,
+    "timing": 0.20,
+    "duration": 0.15,
+    "platform": 0.15,
+    "title_style": 0.15,
+    "content_type": 0.10
+})
+
+# Target duration and reasoning for the best duration group; other groups use "long"
+DURATION_TARGETS = {
+    "short": ("25-30 seconds", "Short clips show best engagement"),
+    "medium": ("35-45 seconds", "Medium-length clips balance content and attention"),
+    "long": ("50-60 seconds", "Longer clips show better performance")
+}
+
+# Hook types and title templates for the best performing emotion
+TITLE_STRATEGIES = {
+    "funny": (
+        ("humor", "relatable", "unexpected"),
+        ("This Will Make You Laugh", "Wait For It...", "Plot Twist!")
+    ),
+    "shocking": (
+        ("surprise", "revelation", "unbelievable"),
+        ("You Won't Believe This", "The Shocking Truth", "This Changes Everything")
+    ),
+    "inspirational": (
+        ("motivation", "success", "transformation"),
+        ("This Changed My Life", "Life Lesson Alert", "Pure Motivation")
+    )
+}
+NO_TITLE_STRATEGY = ((), ())
+
+# Platforms that get a posting schedule
+SCHEDULE_PLATFORMS = ("youtube", "tiktok", "instagram")
+
+# Platform-specific posting time added to the schedule unless one of the
+# listed times is already in it
+PLATFORM_TIME_HINTS = {
+    # TikTok performs well in evening
+    "tiktok": ("19:00", ("19:00", "20:00")),
+    # Instagram Reels perform well during lunch and evening
+    "instagram": ("12:00", ("12:00",))
+}
+
+
+def _dig(data: Any, *keys: str, default: Any = None) -> Any:
+    """
+    Look up a nested value in the trends dictionary
+    
+    Missing keys and sections that aren't dictionaries (e.g. None) give the
+    default instead of raising or needing a {} default at every level.
+    """
+    for key in keys:
+        if not isinstance(data, dict):
+            return default
+        data = data.get(key)
+    return default if data is None else data
+
+
+def _best_duration_group(duration_analysis: Dict[str, Dict[str, Any]]) -> str:
+    """Duration group with the highest average performance (the first one on ties)"""
+    performances = [
+        (group, stats.get("average_performance", 0)) for group, stats in duration_analysis.items()
+    ]
+    return max(performances, key=itemgetter(1))[0]
+
+
+def _confidence_kernel(emotion_scores: np.ndarray, platform_scores: np.ndarray, total_clips: int) -> float:
+    """
+    Confidence score from flattened performance data
+    
+    Args:
+        emotion_scores: Performance scores of every clip
+        platform_scores: Average performance per platform
+        total_clips: Number of tracked clips
+        
+    Returns:
+        Mean of the data volume, variance, time range and platform consistency factors
+    """
+    confidence_factors = []
+    
+    # Data volume confidence
+    data_confidence = min(total_clips / 50, 1.0)  # Full confidence at 50+ clips
+    confidence_factors.append(data_confidence)
+    
+    # Performance variance confidence
+    if emotion_scores.size > 1:
+        variance = float(emotion_scores.std(ddof=1))
+        variance_confidence = max(0, 1 - (variance / 100))  # Lower variance = higher confidence
+        confidence_factors.append(variance_confidence)
+    
+    # Time range confidence (more recent data = higher confidence)
+    # This would require timestamp analysis - simplified for now
+    time_confidence = 0.8  # Assume reasonable time range
+    confidence_factors.append(time_confidence)
+    
+    # Platform consistency confidence
+    if platform_scores.size > 1:
+        mean_score = float(platform_scores.mean())
+        # Consistency is undefined when no platform has performed yet
+        if mean_score > 0:
+            consistency = 1 - float(platform_scores.std(ddof=1)) / mean_score
+            consistency_confidence = max(0, min(consistency, 1))
+            confidence_factors.append(consistency_confidence)
+    
+    return float(np.mean(confidence_factors))
 
 
 class OptimizationEngine:
@@ -34,23 +157,37 @@ class OptimizationEngine:
         self.confidence_threshold = 0.7
         
         # Optimization weights for different factors
-        self.optimization_weights = {
-            "emotion": 0.25,
-            "timing": 0.20,
-            "duration": 0.15,
-            "platform": 0.15,
-            "title_style": 0.15,
-            "content_type": 0.10
-        }
+        self.optimization_weights = OPTIMIZATION_WEIGHTS
+        
+        # When the last full optimization ran and what it produced, kept next to
+        # the metrics files so the interval survives restarts
+        self.file_handler = FileHandler()
+        self.state_file = Path("analytics/optimization_state.json")
+        state = self.file_handler.load_json(self.state_file) or {}
+        self._last_optimized_ts = float(state.get("last_optimized_ts") or 0)
+        self._last_result: Optional[Dict[str, Any]] = state.get("last_result")
     
-    async def optimize_content_strategy(self) -> Dict[str, Any]:
+    async def optimize_content_strategy(self, force: bool = False) -> Dict[str, Any]:
         """
         Analyze performance data and generate optimization recommendations
         
+        Args:
+            force: Run even if the optimization interval hasn't passed yet
+        
         Returns:
             Optimization recommendations and updated strategies
         """
         try:
+            # Optimizing more often than the configured interval only repeats the same work
+            elapsed = time.time() - self._last_optimized_ts
+            if not force and elapsed < self.optimization_interval * 86400:
+                if self._last_result:
+                    logger.debug("🎯 Optimization interval not reached, reusing last results")
+                    return self._last_result
+                
+                logger.info(f"⏭️ Skipping optimization, last run {elapsed / 3600:.1f} hours ago")
+                return {"status": "skipped", "message": "Optimization interval not reached"}
+            
             logger.info("🎯 Running content strategy optimization...")
             
             # Get performance trends
@@ -60,19 +197,29 @@ class OptimizationEngine:
                 logger.warning("⚠️ Insufficient data for optimization")
                 return {"status": "insufficient_data", "message": "Need more performance data"}
             
-            # Generate optimizations
+            # Generate optimizations (plain CPU work over the trends dict)
             optimizations = {
-                "emotion_strategy": await self._optimize_emotion_strategy(trends),
-                "timing_strategy": await self._optimize_timing_strategy(trends),
-                "duration_strategy": await self._optimize_duration_strategy(trends),
-                "platform_strategy": await self._optimize_platform_strategy(trends),
-                "title_strategy": await self._optimize_title_strategy(trends),
-                "content_recommendations": await self._generate_content_recommendations(trends),
-                "updated_config": await self._generate_updated_config(trends),
-                "confidence_score": await self._calculate_optimization_confidence(trends),
+                "emotion_strategy": self._optimize_emotion_strategy(trends),
+                "timing_strategy": self._optimize_timing_strategy(trends),
+                "duration_strategy": self._optimize_duration_strategy(trends),
+                "platform_strategy": self._optimize_platform_strategy(trends),
+                "title_strategy": self._optimize_title_strategy(trends),
+                "content_recommendations": self._generate_content_recommendations(trends),
+                "updated_config": self._generate_updated_config(trends),
+                "confidence_score": self._calculate_optimization_confidence(trends),
                 "last_optimized": datetime.now().isoformat()
             }
             
+            self._last_optimized_ts = time.time()
+            self._last_result = optimizations
+            
+            # Record the run (file write, kept off the event loop)
+            await asyncio.to_thread(
+                self.file_handler.save_json,
+                {"last_optimized_ts": self._last_optimized_ts, "last_result": optimizations},
+                self.state_file
+            )
+            
             # Apply optimizations if confidence is high enough
             if optimizations["confidence_score"] >= self.confidence_threshold:
                 await self._apply_optimizations(optimizations)
@@ -86,10 +233,9 @@ class OptimizationEngine:
             logger.error(f"❌ Error in optimization engine: {e}")
             return {"status": "error", "message": str(e)}
     
-    async def _optimize_emotion_strategy(self, trends: Dict[str, Any]) -> Dict[str, Any]:
+    def _optimize_emotion_strategy(self, trends: Dict[str, Any]) -> Dict[str, Any]:
         """Optimize emotion targeting based on performance"""
-        emotion_performance = trends.get("emotion_performance", {})
-        emotion_rankings = emotion_performance.get("emotion_rankings", [])
+        emotion_rankings = _dig(trends, "emotion_performance", "emotion_rankings", default=[])
         
         if not emotion_rankings:
             return {"status": "no_data"}
@@ -98,109 +244,95 @@ class OptimizationEngine:
         top_emotions = emotion_rankings[:3]
         worst_emotions = emotion_rankings[-2:] if len(emotion_rankings) > 2 else []
         
+        # Calculate new emotion weights, normalized by the total the tracker already summed
+        performances = [(emotion, stats["average_performance"]) for emotion, stats in emotion_rankings]
+        total_performance = _dig(trends, "emotion_performance", "total_performance") or math.fsum(
+            performance for _, performance in performances
+        )
+        
         recommendations = {
             "prioritize_emotions": [emotion for emotion, _ in top_emotions],
             "avoid_emotions": [emotion for emotion, _ in worst_emotions],
-            "emotion_weights": {}
+            "emotion_weights": {
+                emotion: round(performance / total_performance, 2) for emotion, performance in performances
+            } if total_performance > 0 else {}
         }
         
-        # Calculate new emotion weights
-        total_performance = sum(stats["average_performance"] for _, stats in emotion_rankings)
-        for emotion, stats in emotion_rankings:
-            if total_performance > 0:
-                weight = stats["average_performance"] / total_performance
-                recommendations["emotion_weights"][emotion] = round(weight, 2)
-        
         return recommendations
     
-    async def _optimize_timing_strategy(self, trends: Dict[str, Any]) -> Dict[str, Any]:
+    def _optimize_timing_strategy(self, trends: Dict[str, Any]) -> Dict[str, Any]:
         """Optimize posting times based on performance"""
-        time_patterns = trends.get("time_patterns", {})
-        best_hours = time_patterns.get("best_hours", [])
+        best_hours = _dig(trends, "time_patterns", "best_hours", default=[])
         
         if not best_hours:
             return {"status": "no_data"}
         
-        # Generate optimized posting schedule
-        optimized_schedule = {}
+        # Best performing hours, formatted once for every platform
+        base_times = tuple(HOUR_LABELS[hour] for hour in best_hours[:3])
         
-        # For each platform, suggest best times
-        for platform in ["youtube", "tiktok", "instagram"]:
-            platform_times = []
-            
-            # Use best performing hours
-            for hour in best_hours[:3]:
-                platform_times.append(f"{hour:02d}:00")
-            
-            # Add platform-specific adjustments
-            if platform == "tiktok":
-                # TikTok performs well in evening
-                if "19:00" not in platform_times and "20:00" not in platform_times:
-                    platform_times.append("19:00")
-            elif platform == "instagram":
-                # Instagram Reels perform well during lunch and evening
-                if "12:00" not in platform_times:
-                    platform_times.append("12:00")
-            
-            optimized_schedule[platform] = platform_times[:4]  # Max 4 times per platform
+        # Platform-specific adjustments, unless the best hours already cover them
+        hints = {
+            platform: () if any(covered in base_times for covered in covered_times) else (hint_time,)
+            for platform, (hint_time, covered_times) in PLATFORM_TIME_HINTS.items()
+        }
+        
+        # For each platform, suggest best times (max 4 per platform)
+        optimized_schedule = {
+            platform: list(base_times + hints.get(platform, ()))[:4]
+            for platform in SCHEDULE_PLATFORMS
+        }
         
         return {
             "optimal_hours": best_hours,
             "posting_schedule": optimized_schedule,
             "recommendations": [
-                f"Post during peak hours: {', '.join(f'{h:02d}:00' for h in best_hours[:3])}",
+                f"Post during peak hours: {', '.join(base_times)}",
                 "Avoid posting during low-engagement hours",
                 "Consider time zone differences for target audience"
             ]
         }
     
-    async def _optimize_duration_strategy(self, trends: Dict[str, Any]) -> Dict[str, Any]:
+    def _optimize_duration_strategy(self, trends: Dict[str, Any]) -> Dict[str, Any]:
         """Optimize video duration based on performance"""
-        content_insights = trends.get("content_insights", {})
-        duration_analysis = content_insights.get("duration_analysis", {})
+        duration_analysis = _dig(trends, "content_insights", "duration_analysis", default={})
         
         if not duration_analysis:
             return {"status": "no_data"}
         
         # Find best performing duration range
-        best_duration_group = max(
-            duration_analysis.items(),
-            key=lambda x: x[1].get("average_performance", 0)
-        )
+        best_duration_group = _best_duration_group(duration_analysis)
         
         duration_recommendations = {
-            "optimal_range": best_duration_group[0],
+            "optimal_range": best_duration_group,
             "performance_by_duration": duration_analysis
         }
         
         # Specific duration recommendations
-        if best_duration_group[0] == "short":
-            duration_recommendations["target_duration"] = "25-30 seconds"
-            duration_recommendations["reasoning"] = "Short clips show best engagement"
-        elif best_duration_group[0] == "medium":
-            duration_recommendations["target_duration"] = "35-45 seconds"
-            duration_recommendations["reasoning"] = "Medium-length clips balance content and attention"
-        else:
-            duration_recommendations["target_duration"] = "50-60 seconds"
-            duration_recommendations["reasoning"] = "Longer clips show better performance"
+        target_duration, reasoning = DURATION_TARGETS.get(best_duration_group, DURATION_TARGETS["long"])
+        duration_recommendations["target_duration"] = target_duration
+        duration_recommendations["reasoning"] = reasoning
         
         return duration_recommendations
     
-    async def _optimize_platform_strategy(self, trends: Dict[str, Any]) -> Dict[str, Any]:
+    def _optimize_platform_strategy(self, trends: Dict[str, Any]) -> Dict[str, Any]:
         """Optimize platform prioritization"""
-        platform_performance = trends.get("platform_performance", {})
-        platform_rankings = platform_performance.get("platform_rankings", [])
+        platform_rankings = _dig(trends, "platform_performance", "platform_rankings", default=[])
         
         if not platform_rankings:
             return {"status": "no_data"}
         
-        # Calculate platform priorities
+        primary_platform = platform_rankings[0][0]
+        
+        # Calculate platform priorities, normalized by the total the tracker already summed
         platform_priorities = {}
-        total_performance = sum(stats["average_performance"] for _, stats in platform_rankings)
+        performances = [(platform, stats.get("average_performance", 0)) for platform, stats in platform_rankings]
+        total_performance = _dig(trends, "platform_performance", "total_performance") or math.fsum(
+            performance for _, performance in performances
+        )
         
-        for platform, stats in platform_rankings:
-            if total_performance > 0:
-                priority = stats["average_performance"] / total_performance
+        if total_performance > 0:
+            for platform, performance in performances:
+                priority = performance / total_performance
                 platform_priorities[platform] = {
                     "priority_score": round(priority, 2),
                     "posting_frequency": "high" if priority > 0.4 else "medium" if priority > 0.25 else "low",
@@ -209,103 +341,69 @@ class OptimizationEngine:
         
         return {
             "platform_priorities": platform_priorities,
-            "primary_platform": platform_rankings[0][0] if platform_rankings else "youtube",
+            "primary_platform": primary_platform,
             "recommendations": [
-                f"Focus on {platform_rankings[0][0]} for best ROI",
+                f"Focus on {primary_platform} for best ROI",
                 "Adjust posting frequency based on platform performance",
                 "Consider platform-specific content optimization"
             ]
         }
     
-    async def _optimize_title_strategy(self, trends: Dict[str, Any]) -> Dict[str, Any]:
+    def _optimize_title_strategy(self, trends: Dict[str, Any]) -> Dict[str, Any]:
         """Optimize title and hook strategies"""
-        # Analyze viral characteristics for title patterns
-        content_insights = trends.get("content_insights", {})
-        viral_characteristics = content_insights.get("viral_characteristics", {})
+        # Based on best performing emotions, suggest title styles
+        best_emotion = _dig(trends, "emotion_performance", "best_emotion", default="neutral")
+        hook_types, title_templates = TITLE_STRATEGIES.get(best_emotion, NO_TITLE_STRATEGY)
         
-        title_recommendations = {
-            "hook_types": [],
+        return {
+            "hook_types": list(hook_types),
             "avoid_patterns": [],
-            "title_templates": []
+            "title_templates": list(title_templates)
         }
-        
-        # Based on best performing emotions, suggest title styles
-        emotion_performance = trends.get("emotion_performance", {})
-        best_emotion = emotion_performance.get("best_emotion", "neutral")
-        
-        if best_emotion == "funny":
-            title_recommendations["hook_types"] = ["humor", "relatable", "unexpected"]
-            title_recommendations["title_templates"] = [
-                "This Will Make You Laugh",
-                "Wait For It...",
-                "Plot Twist!"
-            ]
-        elif best_emotion == "shocking":
-            title_recommendations["hook_types"] = ["surprise", "revelation", "unbelievable"]
-            title_recommendations["title_templates"] = [
-                "You Won't Believe This",
-                "The Shocking Truth",
-                "This Changes Everything"
-            ]
-        elif best_emotion == "inspirational":
-            title_recommendations["hook_types"] = ["motivation", "success", "transformation"]
-            title_recommendations["title_templates"] = [
-                "This Changed My Life",
-                "Life Lesson Alert",
-                "Pure Motivation"
-            ]
-        
-        return title_recommendations
     
-    async def _generate_content_recommendations(self, trends: Dict[str, Any]) -> List[str]:
+    def _generate_content_recommendations(self, trends: Dict[str, Any]) -> List[str]:
         """Generate specific content creation recommendations"""
-        recommendations = []
-        
-        # Emotion recommendations
-        emotion_performance = trends.get("emotion_performance", {})
-        best_emotion = emotion_performance.get("best_emotion")
-        if best_emotion:
-            recommendations.append(f"Create more {best_emotion} content - it performs best")
-        
-        # Duration recommendations
-        content_insights = trends.get("content_insights", {})
-        viral_characteristics = content_insights.get("viral_characteristics", {})
-        if viral_characteristics.get("average_duration"):
-            avg_duration = viral_characteristics["average_duration"]
-            recommendations.append(f"Target {avg_duration:.0f}-second clips for viral potential")
-        
-        # Platform-specific recommendations
-        platform_performance = trends.get("platform_performance", {})
-        best_platform = platform_performance.get("best_platform")
-        if best_platform:
-            recommendations.append(f"Prioritize content creation for {best_platform}")
-        
-        # Timing recommendations
-        time_patterns = trends.get("time_patterns", {})
-        optimal_times = time_patterns.get("recommendations", {}).get("optimal_posting_times", [])
-        if optimal_times:
-            recommendations.append(f"Schedule posts for {', '.join(optimal_times[:3])}")
-        
-        # Viral analysis recommendations
-        if viral_characteristics.get("count", 0) > 0:
-            common_emotions = viral_characteristics.get("common_emotions", [])
-            if common_emotions:
-                recommendations.append(f"Viral content often uses: {', '.join(common_emotions)}")
+        best_emotion = _dig(trends, "emotion_performance", "best_emotion")
+        viral_characteristics = _dig(trends, "content_insights", "viral_characteristics", default={})
+        avg_duration = viral_characteristics.get("average_duration")
+        best_platform = _dig(trends, "platform_performance", "best_platform")
+        optimal_times = _dig(trends, "time_patterns", "recommendations", "optimal_posting_times", default=[])
+        common_emotions = viral_characteristics.get("common_emotions") if viral_characteristics.get("count", 0) > 0 else None
+        
+        # Each recommendation is only formatted when its data is present; falsy entries are dropped
+        candidates = (
+            # Emotion recommendations
+            best_emotion and f"Create more {best_emotion} content - it performs best",
+            # Duration recommendations
+            avg_duration and f"Target {avg_duration:.0f}-second clips for viral potential",
+            # Platform-specific recommendations
+            best_platform and f"Prioritize content creation for {best_platform}",
+            # Timing recommendations
+            optimal_times and f"Schedule posts for {', '.join(optimal_times[:3])}",
+            # Viral analysis recommendations
+            common_emotions and f"Viral content often uses: {', '.join(common_emotions)}"
+        )
         
-        return recommendations
+        return [recommendation for recommendation in candidates if recommendation]
     
-    async def _generate_updated_config(self, trends: Dict[str, Any]) -> Dict[str, Any]:
+    def _generate_updated_config(self, trends: Dict[str, Any]) -> Dict[str, Any]:
         """Generate updated configuration based on optimization"""
         updated_config = {}
         
         # Update AI analysis weights
-        emotion_performance = trends.get("emotion_performance", {})
-        if emotion_performance.get("emotion_stats"):
-            emotion_weights = {}
-            for emotion, stats in emotion_performance["emotion_stats"].items():
-                # Normalize performance to weight
-                weight = min(stats.get("average_performance", 50) / 50, 2.0)
-                emotion_weights[emotion] = round(weight, 2)
+        emotion_stats = _dig(trends, "emotion_performance", "emotion_stats")
+        if emotion_stats:
+            averages = np.fromiter(
+                (stats.get("average_performance", 50) for stats in emotion_stats.values()),
+                dtype=np.float64, count=len(emotion_stats)
+            )
+            
+            # Normalize performance to weight (50 -> 1.0, capped at 2.0); rounded
+            # with round() so weights match the decimal rounding used elsewhere
+            weights = np.minimum(averages / 50, 2.0)
+            emotion_weights = {
+                emotion: round(weight, 2) for emotion, weight in zip(emotion_stats, weights.tolist())
+            }
             
             updated_config["ai"] = {
                 "analysis": {
@@ -314,78 +412,55 @@ class OptimizationEngine:
             }
         
         # Update posting schedule
-        time_patterns = trends.get("time_patterns", {})
-        if time_patterns.get("best_hours"):
-            posting_times = {}
-            for platform in ["youtube", "tiktok", "instagram"]:
-                times = []
-                for hour in time_patterns["best_hours"][:3]:
-                    times.append(f"{hour:02d}:00")
-                posting_times[platform] = times
+        best_hours = _dig(trends, "time_patterns", "best_hours")
+        if best_hours:
+            times = [HOUR_LABELS[hour] for hour in best_hours[:3]]
+            # Separate lists per platform, shared ones would be saved as YAML aliases
+            posting_times = {platform: list(times) for platform in SCHEDULE_PLATFORMS}
             
             updated_config["scheduler"] = {
                 "posting_times": posting_times
             }
         
         # Update video duration targets
-        content_insights = trends.get("content_insights", {})
-        duration_analysis = content_insights.get("duration_analysis", {})
+        duration_analysis = _dig(trends, "content_insights", "duration_analysis")
         if duration_analysis:
-            best_duration = max(
-                duration_analysis.items(),
-                key=lambda x: x[1].get("average_performance", 0)
-            )[0]
-            
-            duration_ranges = {
-                "short": {"min": 25, "max": 35},
-                "medium": {"min": 35, "max": 50}, 
-                "long": {"min": 50, "max": 65}
-            }
+            best_duration = _best_duration_group(duration_analysis)
             
-            if best_duration in duration_ranges:
-                range_config = duration_ranges[best_duration]
+            duration_range = DURATION_RANGES.get(best_duration)
+            if duration_range:
                 updated_config["video"] = {
-                    "clip_duration_min": range_config["min"],
-                    "clip_duration_max": range_config["max"]
+                    "clip_duration_min": duration_range[0],
+                    "clip_duration_max": duration_range[1]
                 }
         
         return updated_config
     
-    async def _calculate_optimization_confidence(self, trends: Dict[str, Any]) -> float:
+    def _calculate_optimization_confidence(self, trends: Dict[str, Any]) -> float:
         """Calculate confidence score for optimization recommendations"""
-        confidence_factors = []
+        emotion_stats = _dig(trends, "emotion_performance", "emotion_stats", default={})
         
-        # Data volume confidence
-        emotion_stats = trends.get("emotion_performance", {}).get("emotion_stats", {})
-        total_clips = sum(stats.get("count", 0) for stats in emotion_stats.values())
-        data_confidence = min(total_clips / 50, 1.0)  # Full confidence at 50+ clips
-        confidence_factors.append(data_confidence)
-        
-        # Performance variance confidence
-        all_scores = []
+        # Count clips and collect score lists in one walk over the emotions
+        total_clips = 0
+        score_lists = []
         for stats in emotion_stats.values():
-            all_scores.extend(stats.get("scores", []))
-        
-        if len(all_scores) > 1:
-            variance = statistics.stdev(all_scores)
-            variance_confidence = max(0, 1 - (variance / 100))  # Lower variance = higher confidence
-            confidence_factors.append(variance_confidence)
-        
-        # Time range confidence (more recent data = higher confidence)
-        # This would require timestamp analysis - simplified for now
-        time_confidence = 0.8  # Assume reasonable time range
-        confidence_factors.append(time_confidence)
-        
-        # Platform consistency confidence
-        platform_stats = trends.get("platform_performance", {}).get("platform_stats", {})
-        if len(platform_stats) > 1:
-            platform_scores = [stats.get("average_performance", 0) for stats in platform_stats.values()]
-            if platform_scores:
-                consistency = 1 - (statistics.stdev(platform_scores) / statistics.mean(platform_scores))
-                consistency_confidence = max(0, min(consistency, 1))
-                confidence_factors.append(consistency_confidence)
-        
-        return statistics.mean(confidence_factors) if confidence_factors else 0.5
+            total_clips += stats.get("count", 0)
+            scores = stats.get("scores")
+            if scores:
+                score_lists.append(scores)
+        
+        # Flatten inputs into contiguous float64 columns for the kernel
+        emotion_scores = (
+            np.concatenate([np.asarray(scores, dtype=np.float64) for scores in score_lists])
+            if score_lists else np.empty(0)
+        )
+        platform_stats = _dig(trends, "platform_performance", "platform_stats", default={})
+        platform_scores = np.fromiter(
+            (stats.get("average_performance", 0) for stats in platform_stats.values()),
+            dtype=np.float64, count=len(platform_stats)
+        )
+        
+        return _confidence_kernel(emotion_scores, platform_scores, total_clips)
     
     async def _apply_optimizations(self, optimizations: Dict[str, Any]):
         """Apply high-confidence optimizations to configuration"""
@@ -395,30 +470,43 @@ class OptimizationEngine:
             if not updated_config:
                 return
             
-            # Update configuration
-            for section, settings in updated_config.items():
-                for key, value in settings.items():
-                    config_key = f"{section}.{key}"
-                    self.config.set(config_key, value)
+            # Update configuration in one step, then save it once
+            self.config.update({
+                f"{section}.{key}": value
+                for section, settings in updated_config.items()
+                for key, value in settings.items()
+            })
             
-            # Save updated configuration
-            self.config.save_config()
+            # Save updated configuration (file write, kept off the event loop)
+            await asyncio.to_thread(self.config.save_config)
             
             logger.success("✅ Applied optimization updates to configuration")
             
         except Exception as e:
             logger.error(f"❌ Error applying optimizations: {e}")
     
+    async def aclose(self):
+        """Write the engagement tracker's queued metrics (call on shutdown)"""
+        await self.engagement_tracker.aclose()
+    
     async def get_optimization_status(self) -> Dict[str, Any]:
         """Get current optimization status and last run information"""
         try:
             # Get performance summary
             performance_summary = await self.engagement_tracker.get_performance_summary()
             
+            if self._last_optimized_ts:
+                last_optimization = datetime.fromtimestamp(self._last_optimized_ts)
+                next_optimization = (last_optimization + timedelta(days=self.optimization_interval)).isoformat()
+                last_optimization = last_optimization.isoformat()
+            else:
+                last_optimization = "never"
+                next_optimization = "now"
+            
             status = {
                 "optimization_enabled": self.analytics_config.get("enabled", True),
-                "last_optimization": "never",  # Would track this in practice
-                "next_optimization": "based_on_interval",
+                "last_optimization": last_optimization,
+                "next_optimization": next_optimization,
                 "data_points": performance_summary.get("total_clips", 0),
                 "viral_rate": performance_summary.get("viral_rate", 0),
                 "average_performance": performance_summary.get("average_performance", 0),
@@ -0,0 +1,160 @@
+"""
+Semantic cache for LLM responses keyed by transcript embeddings
+"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from loguru import logger
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+    logger.debug("sentence-transformers not available, LLM semantic cache disabled. Install with: pip install sentence-transformers")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    cache_key TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    response TEXT NOT NULL,
+    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_responses_cache_key ON responses (cache_key);
+"""
+
+
+def make_cache_key(*parts) -> str:
+    """Hash the settings a cached response depends on (model, prompt template, sampling)"""
+    return hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+
+class SemanticCache:
+    """
+    Reuses LLM responses for transcript chunks that are identical or close
+    paraphrases of chunks seen before
+    
+    Chunks are embedded with a small sentence-transformers model. Embeddings
+    are L2-normalized, so the inner product with every stored embedding of
+    the same cache key is the cosine similarity; a hit needs the best match
+    to reach the threshold. Pairs are persisted in SQLite so the cache
+    survives restarts. Methods are blocking and thread-safe; call them
+    through asyncio.to_thread from async code.
+    """
+    
+    def __init__(self, db_path: Union[str, Path] = "models/llm_cache.db",
+                 model_name: str = "all-MiniLM-L6-v2", threshold: float = 0.93):
+        """Initialize the cache (disabled when sentence-transformers is missing)"""
+        self.db_path = Path(db_path)
+        self.threshold = threshold
+        self.encoder = None
+        self.db = None
+        
+        # cache_key -> (embedding matrix, responses), loaded from the DB on first use
+        self._indexes: Dict[str, Tuple[np.ndarray, List[str]]] = {}
+        self._lock = threading.Lock()
+        
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            return
+        
+        try:
+            self.encoder = SentenceTransformer(model_name)
+            
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self.db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.executescript(SCHEMA)
+            
+            logger.info(f"🧠 LLM semantic cache ready: {self.db_path}")
+        
+        except Exception as e:
+            logger.warning(f"⚠️ Could not initialize LLM semantic cache: {e}")
+            self.encoder = None
+            self.db = None
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether lookups and stores do anything"""
+        return self.encoder is not None and self.db is not None
+    
+    def encode(self, text: str) -> np.ndarray:
+        """Embed text as a normalized float32 vector"""
+        return self.encoder.encode(text, normalize_embeddings=True).astype(np.float32)
+    
+    def _get_index(self, cache_key: str) -> Tuple[np.ndarray, List[str]]:
+        """Embeddings and responses stored under a cache key (call with the lock held)"""
+        index = self._indexes.get(cache_key)
+        if index is None:
+            rows = self.db.execute(
+                "SELECT embedding, response FROM responses WHERE cache_key = ?", (cache_key,)
+            ).fetchall()
+            embeddings = [np.frombuffer(embedding, dtype=np.float32) for embedding, _ in rows]
+            matrix = np.vstack(embeddings) if embeddings else None
+            index = (matrix, [response for _, response in rows])
+            self._indexes[cache_key] = index
+        return index
+    
+    def lookup(self, embedding: np.ndarray, cache_key: str) -> Optional[str]:
+        """
+        Find a stored response for a similar chunk
+        
+        Args:
+            embedding: Normalized chunk embedding from encode()
+            cache_key: Key from make_cache_key for the current settings
+        
+        Returns:
+            Stored LLM response, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        
+        try:
+            with self._lock:
+                matrix, responses = self._get_index(cache_key)
+                if matrix is None:
+                    return None
+                
+                similarities = matrix @ embedding
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    logger.debug(f"🧠 LLM cache hit (similarity {similarities[best]:.3f})")
+                    return responses[best]
+        
+        except Exception as e:
+            logger.warning(f"⚠️ LLM cache lookup failed: {e}")
+        
+        return None
+    
+    def store(self, embedding: np.ndarray, cache_key: str, response: str):
+        """
+        Remember the LLM response for a chunk
+        
+        Args:
+            embedding: Normalized chunk embedding from encode()
+            cache_key: Key from make_cache_key for the current settings
+            response: Raw LLM response text
+        """
+        if not self.enabled:
+            return
+        
+        try:
+            with self._lock:
+                # Load existing rows before inserting, or the new row would be read back too
+                matrix, responses = self._get_index(cache_key)
+                
+                self.db.execute(
+                    "INSERT INTO responses (cache_key, embedding, response) VALUES (?, ?, ?)",
+                    (cache_key, embedding.tobytes(), response)
+                )
+                self.db.commit()
+                
+                matrix = embedding[None, :] if matrix is None else np.vstack([matrix, embedding])
+                self._indexes[cache_key] = (matrix, responses + [response])
+        
+        except Exception as e:
+            logger.warning(f"⚠️ LLM cache store failed: {e}")
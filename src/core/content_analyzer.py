@@ -4,15 +4,102 @@ Content analysis module for detecting viral moments and highlights in video tran
 
 import re
 import asyncio
-from typing import Dict, Any, List, Optional
+import random
+from bisect import bisect_left, insort
+from collections import defaultdict
+from functools import lru_cache
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import json
 
+import numpy as np
 from loguru import logger
 
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+    logger.debug("pyahocorasick not available, matching keywords one by one. Install with: pip install pyahocorasick")
+
 from ..ai.llm_analyzer import LLMAnalyzer
 from ..utils.config import Config
 
+# LLM highlights starting or ending within this many seconds of an existing highlight merge into it
+MERGE_WINDOW = 10
+
+# Hashtags every highlight starts with, and the ones used to fill up to the minimum count
+BASE_HASHTAGS = ('#viral', '#trending', '#fyp')
+GENERIC_HASHTAGS = ('#content', '#video', '#shorts', '#reels', '#tiktok')
+
+# Emotion-based hashtags
+EMOTION_HASHTAGS = {
+    'funny': ('#comedy', '#humor', '#laugh'),
+    'shocking': ('#mindblown', '#incredible', '#wow'),
+    'inspirational': ('#motivation', '#inspiration', '#success'),
+    'educational': ('#learning', '#facts', '#knowledge'),
+    'controversial': ('#debate', '#opinion', '#discussion')
+}
+
+# Common topic keywords and their hashtags
+TOPIC_HASHTAGS = {
+    'business': '#business', 'money': '#money', 'success': '#success',
+    'health': '#health', 'fitness': '#fitness', 'food': '#food',
+    'technology': '#tech', 'ai': '#ai', 'science': '#science',
+    'travel': '#travel', 'lifestyle': '#lifestyle', 'tips': '#tips'
+}
+
+# All topic keywords as whole words in one pattern, so the text is scanned once
+_TOPIC_RE = re.compile(r'\b(' + '|'.join(map(re.escape, TOPIC_HASHTAGS)) + r')\b')
+
+# Priority order for picking a highlight's primary emotion
+EMOTION_PRIORITY = ('funny', 'shocking', 'inspirational', 'controversial', 'educational')
+
+
+@lru_cache(maxsize=1024)
+def _primary_emotion(emotions: Tuple[str, ...]) -> str:
+    """Primary emotion of an emotion tuple (cached, the same few combinations repeat)"""
+    if not emotions:
+        return 'neutral'
+    
+    for emotion in EMOTION_PRIORITY:
+        if emotion in emotions:
+            return emotion
+    
+    return emotions[0]
+
+
+def _first_index(condition: Callable[[int], bool], guess: int, lo: int, hi: int) -> int:
+    """
+    First index in [lo, hi] where a monotonic condition holds (hi if none)
+    
+    The guess comes from a binary search on segment times; stepping from it
+    against the exact condition keeps float rounding at the boundary from
+    moving the result.
+    """
+    index = min(max(guess, lo), hi)
+    while index < hi and not condition(index):
+        index += 1
+    while index > lo and condition(index - 1):
+        index -= 1
+    return index
+
+
+def _last_index(condition: Callable[[int], bool], guess: int, lo: int, hi: int) -> int:
+    """Last index in [lo, hi] where a monotonic condition holds (lo if none), see _first_index"""
+    index = min(max(guess, lo), hi)
+    while index > lo and not condition(index):
+        index -= 1
+    while index < hi and condition(index + 1):
+        index += 1
+    return index
+
+
+def _nearby(index: List[Tuple[float, int]], time: float, window: float) -> List[Tuple[float, int]]:
+    """Entries of a sorted (time, position) list within about window seconds of time"""
+    # One second of slack on both sides, callers apply the exact distance check
+    return index[bisect_left(index, (time - window - 1,)):bisect_left(index, (time + window + 1,))]
+
 
 class ContentAnalyzer:
     """Analyzes video content to identify viral moments and create highlights"""
@@ -22,6 +109,7 @@ class ContentAnalyzer:
         self.config = config
         self.ai_config = config.get_ai_config()
         self.analysis_config = self.ai_config.get("analysis", {})
+        self.hashtag_config = config.get_hashtag_config()
         
         # Initialize LLM analyzer
         self.llm_analyzer = LLMAnalyzer(config)
@@ -64,8 +152,61 @@ class ContentAnalyzer:
             r"real reason why"
         ]
         
+        # All hook patterns in one alternation, so a segment is scanned once
+        self._hook_re = re.compile("(?:" + "|".join(self.hook_patterns) + ")", re.IGNORECASE)
+        
         # Engagement boost keywords
         self.boost_keywords = self.analysis_config.get("keywords_boost", [])
+        self._boost_lower = [keyword.lower() for keyword in self.boost_keywords]
+        
+        # Emotion and boost keywords in one automaton, so a segment is scanned once
+        self._keyword_automaton = self._build_keyword_automaton() if AHOCORASICK_AVAILABLE else None
+        
+        # Cap on highlights enriched at once (title/description generation may call out to an LLM)
+        self._enrich_semaphore = asyncio.Semaphore(max(1, self.analysis_config.get("enrich_concurrency", 5)))
+        
+        # Title and hashtag results by (text, emotions), reused when highlights repeat across reruns
+        self._title_cache: Dict[Tuple[str, Tuple[str, ...]], Any] = {}
+        self._hashtag_cache: Dict[Tuple[str, Tuple[str, ...]], List[str]] = {}
+        self._enrich_cache_size = 512
+    
+    def _build_keyword_automaton(self):
+        """Aho-Corasick automaton mapping each keyword to (keyword, emotions, is boost keyword)"""
+        labels = {}
+        for emotion, keywords in self.emotion_keywords.items():
+            for keyword in keywords:
+                labels.setdefault(keyword, ([], False))[0].append(emotion)
+        for keyword in self._boost_lower:
+            emotions, _ = labels.get(keyword, ([], False))
+            labels[keyword] = (emotions, True)
+        
+        automaton = ahocorasick.Automaton()
+        for keyword, (emotions, boost) in labels.items():
+            automaton.add_word(keyword, (keyword, tuple(emotions), boost))
+        automaton.make_automaton()
+        return automaton
+    
+    def _count_keywords(self, text: str) -> Tuple[Dict[str, int], int]:
+        """
+        Count the distinct emotion and boost keywords found in lowercased text
+        
+        Returns:
+            Keyword count per emotion and the boost keyword count
+        """
+        emotion_counts = defaultdict(int)
+        boost_count = 0
+        
+        if self._keyword_automaton is not None:
+            for keyword, emotions, boost in {match for _, match in self._keyword_automaton.iter(text)}:
+                for emotion in emotions:
+                    emotion_counts[emotion] += 1
+                boost_count += boost
+        else:
+            for emotion, keywords in self.emotion_keywords.items():
+                emotion_counts[emotion] = sum(1 for keyword in keywords if keyword in text)
+            boost_count = sum(1 for keyword in self._boost_lower if keyword in text)
+        
+        return emotion_counts, boost_count
     
     async def find_highlights(self, transcript: Dict[str, Any], video_metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -86,14 +227,14 @@ class ContentAnalyzer:
                 logger.warning("⚠️ No transcript segments found")
                 return []
             
-            # Step 1: Score all segments
-            scored_segments = await self._score_segments(segments)
-            
-            # Step 2: Use LLM for intelligent analysis
-            llm_highlights = await self.llm_analyzer.analyze_content(
-                transcript['text'],
-                segments,
-                video_metadata
+            # Step 1 and 2: Score all segments in a worker thread while the LLM analyzes the transcript
+            scored_segments, llm_highlights = await asyncio.gather(
+                self._score_segments(segments),
+                self.llm_analyzer.analyze_content(
+                    transcript['text'],
+                    segments,
+                    video_metadata
+                )
             )
             
             # Step 3: Combine scoring approaches
@@ -117,54 +258,64 @@ class ContentAnalyzer:
             return []
     
     async def _score_segments(self, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Score segments based on viral indicators"""
-        scored_segments = []
+        """Score segments based on viral indicators without blocking the event loop"""
+        return await asyncio.to_thread(self._score_segments_sync, segments)
+    
+    def _score_segments_sync(self, segments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Score segments based on viral indicators (blocking, run via asyncio.to_thread)"""
+        count = len(segments)
+        emotion_names = tuple(self.emotion_keywords)
+        
+        # Count each segment's indicators, then score all segments at once
+        texts = []
+        emotion_counts = np.zeros((count, len(emotion_names)))
+        hook_counts = np.zeros(count)
+        boost_counts = np.zeros(count)
+        word_counts = np.zeros(count, dtype=int)
         
         for i, segment in enumerate(segments):
-            text = segment['text'].lower()
-            score = 0.0
-            emotions = []
-            
-            # Emotion detection
-            for emotion, keywords in self.emotion_keywords.items():
-                emotion_score = sum(1 for keyword in keywords if keyword in text)
-                if emotion_score > 0:
-                    emotions.append(emotion)
-                    weight = self.analysis_config.get("emotion_weights", {}).get(emotion, 1.0)
-                    score += emotion_score * weight
-            
-            # Hook pattern detection
-            hook_score = sum(1 for pattern in self.hook_patterns if re.search(pattern, text, re.IGNORECASE))
-            score += hook_score * 2.0  # Hooks are very important
-            
-            # Boost keywords
-            boost_score = sum(1 for keyword in self.boost_keywords if keyword.lower() in text)
-            score += boost_score * 1.5
+            # Lowercased once per segment and passed along on the scored segment
+            # (the LLM analyzer may have stored it on the segment already)
+            text = segment.get('_lower') or segment['text'].lower()
+            texts.append(text)
             
-            # Length penalty (very short or very long segments are less viral)
-            text_length = len(text.split())
-            if text_length < 5:
-                score *= 0.5
-            elif text_length > 100:
-                score *= 0.7
+            counts, boost_counts[i] = self._count_keywords(text)
+            emotion_counts[i] = [counts.get(emotion, 0) for emotion in emotion_names]
             
-            # Position bonus (beginning and end segments often contain hooks)
-            if i < len(segments) * 0.1:  # First 10%
-                score *= 1.2
-            elif i > len(segments) * 0.9:  # Last 10%
-                score *= 1.1
-            
-            scored_segments.append({
+            # Hook pattern detection (each distinct hook counts once)
+            hook_counts[i] = len(set(self._hook_re.findall(text)))
+            word_counts[i] = len(text.split())
+        
+        # Emotion detection (weights are read per call, the optimizer may update them).
+        # Accumulated one emotion at a time, in the same order as a per-segment sum.
+        emotion_weights = self.analysis_config.get("emotion_weights", {})
+        scores = np.zeros(count)
+        for column, emotion in enumerate(emotion_names):
+            scores += emotion_counts[:, column] * emotion_weights.get(emotion, 1.0)
+        
+        scores += hook_counts * 2.0  # Hooks are very important
+        scores += boost_counts * 1.5  # Boost keywords
+        
+        # Length penalty (very short or very long segments are less viral)
+        scores *= np.where(word_counts < 5, 0.5, np.where(word_counts > 100, 0.7, 1.0))
+        
+        # Position bonus (beginning and end segments often contain hooks: first and last 10%)
+        positions = np.arange(count)
+        scores *= np.where(positions < count * 0.1, 1.2, np.where(positions > count * 0.9, 1.1, 1.0))
+        
+        return [
+            {
                 'segment_index': i,
                 'start_time': segment['start'],
                 'end_time': segment['end'],
                 'text': segment['text'],
+                '_lower': text,
                 'score': score,
-                'emotions': emotions,
+                'emotions': [emotion for emotion, found in zip(emotion_names, counts) if found > 0],
                 'duration': segment['end'] - segment['start']
-            })
-        
-        return scored_segments
+            }
+            for i, (segment, text, score, counts) in enumerate(zip(segments, texts, scores.tolist(), emotion_counts))
+        ]
     
     async def _combine_analyses(self, scored_segments: List[Dict[str, Any]], 
                                llm_highlights: List[Dict[str, Any]], 
@@ -177,93 +328,118 @@ class ContentAnalyzer:
         clip_min_duration = self.config.get("video.clip_duration_min", 25)
         clip_max_duration = self.config.get("video.clip_duration_max", 65)
         
+        # Segment boundaries for binary searches (segments are in time order)
+        starts = np.array([segment['start'] for segment in original_segments], dtype=float)
+        ends = np.array([segment['end'] for segment in original_segments], dtype=float)
+        last_idx = len(original_segments) - 1
+        
         for segment in scored_segments:
             if segment['score'] >= min_score:
                 # Extend segment to meet minimum duration
                 start_idx = segment['segment_index']
-                end_idx = start_idx
-                total_duration = segment['duration']
                 
-                # Extend forward if needed
-                while (end_idx < len(original_segments) - 1 and 
-                       total_duration < clip_min_duration):
-                    end_idx += 1
-                    total_duration = original_segments[end_idx]['end'] - original_segments[start_idx]['start']
+                # Extend forward to the first segment end that reaches the minimum
+                end_idx = _first_index(
+                    lambda i: ends[i] - starts[start_idx] >= clip_min_duration,
+                    int(np.searchsorted(ends, starts[start_idx] + clip_min_duration)),
+                    start_idx, last_idx
+                )
                 
                 # Extend backward if still too short
-                while (start_idx > 0 and 
-                       total_duration < clip_min_duration):
-                    start_idx -= 1
-                    total_duration = original_segments[end_idx]['end'] - original_segments[start_idx]['start']
+                start_idx = _last_index(
+                    lambda i: ends[end_idx] - starts[i] >= clip_min_duration,
+                    int(np.searchsorted(starts, ends[end_idx] - clip_min_duration, side='right')) - 1,
+                    0, start_idx
+                )
                 
                 # Trim if too long
-                while total_duration > clip_max_duration and end_idx > start_idx:
-                    end_idx -= 1
-                    total_duration = original_segments[end_idx]['end'] - original_segments[start_idx]['start']
+                end_idx = _last_index(
+                    lambda i: ends[i] - starts[start_idx] <= clip_max_duration,
+                    int(np.searchsorted(ends, starts[start_idx] + clip_max_duration, side='right')) - 1,
+                    start_idx, end_idx
+                )
                 
                 # Combine text from all segments in range
                 combined_text = ' '.join([
                     original_segments[i]['text'] 
                     for i in range(start_idx, end_idx + 1)
                 ])
+                combined_lower = ' '.join([
+                    scored_segments[i]['_lower']
+                    for i in range(start_idx, end_idx + 1)
+                ])
                 
                 combined.append({
                     'start_time': original_segments[start_idx]['start'],
                     'end_time': original_segments[end_idx]['end'],
                     'text': combined_text,
+                    '_lower': combined_lower,
                     'score': segment['score'],
                     'emotions': segment['emotions'],
                     'source': 'rule_based',
                     'confidence': min(segment['score'] / 3.0, 1.0)  # Normalize confidence
                 })
         
+        # Highlights indexed by (start, position) and (end, position), so each LLM highlight
+        # only checks the ones near its start or end instead of all of them
+        by_start = sorted((highlight['start_time'], i) for i, highlight in enumerate(combined))
+        by_end = sorted((highlight['end_time'], i) for i, highlight in enumerate(combined))
+        
         # Add LLM highlights
         for llm_highlight in llm_highlights:
-            # Check for overlap with existing highlights
-            overlap_found = False
-            for existing in combined:
-                if (abs(llm_highlight['start_time'] - existing['start_time']) < 10 or
-                    abs(llm_highlight['end_time'] - existing['end_time']) < 10):
-                    # Merge with existing highlight (take higher confidence)
-                    if llm_highlight.get('confidence', 0) > existing.get('confidence', 0):
-                        existing.update(llm_highlight)
-                        existing['source'] = 'combined'
-                    overlap_found = True
-                    break
+            start_time = llm_highlight['start_time']
+            end_time = llm_highlight['end_time']
             
-            if not overlap_found:
+            # Check for overlap with existing highlights (the earliest added one wins)
+            matches = [
+                i for _, i in _nearby(by_start, start_time, MERGE_WINDOW) + _nearby(by_end, end_time, MERGE_WINDOW)
+                if (abs(start_time - combined[i]['start_time']) < MERGE_WINDOW or
+                    abs(end_time - combined[i]['end_time']) < MERGE_WINDOW)
+            ]
+            
+            if matches:
+                position = min(matches)
+                existing = combined[position]
+                # Merge with existing highlight (take higher confidence)
+                if llm_highlight.get('confidence', 0) > existing.get('confidence', 0):
+                    by_start.remove((existing['start_time'], position))
+                    by_end.remove((existing['end_time'], position))
+                    # The lowercased text belongs to the replaced text
+                    existing.pop('_lower', None)
+                    existing.update(llm_highlight)
+                    existing['source'] = 'combined'
+                    insort(by_start, (existing['start_time'], position))
+                    insort(by_end, (existing['end_time'], position))
+            else:
                 llm_highlight['source'] = 'llm'
+                insort(by_start, (start_time, len(combined)))
+                insort(by_end, (end_time, len(combined)))
                 combined.append(llm_highlight)
         
         return combined
     
     async def _filter_highlights(self, highlights: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Filter and rank highlights by quality"""
-        # Remove duplicates and overlaps
-        filtered = []
         highlights.sort(key=lambda x: x.get('confidence', 0), reverse=True)
+        max_highlights = 5
         
-        for highlight in highlights:
-            # Check for significant overlap with existing highlights
-            overlap_found = False
-            for existing in filtered:
-                overlap_start = max(highlight['start_time'], existing['start_time'])
-                overlap_end = min(highlight['end_time'], existing['end_time'])
-                overlap_duration = max(0, overlap_end - overlap_start)
-                
-                highlight_duration = highlight['end_time'] - highlight['start_time']
-                overlap_ratio = overlap_duration / highlight_duration
-                
-                if overlap_ratio > 0.5:  # More than 50% overlap
-                    overlap_found = True
+        # Overlap of every highlight with every other, as a share of the first one's duration
+        starts = np.array([highlight['start_time'] for highlight in highlights], dtype=float)
+        ends = np.array([highlight['end_time'] for highlight in highlights], dtype=float)
+        overlap = np.maximum(0, np.minimum(ends[:, None], ends[None, :]) - np.maximum(starts[:, None], starts[None, :]))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            overlap_ratio = overlap / (ends - starts)[:, None]
+        
+        # Remove duplicates and overlaps: keep each highlight unless it overlaps a
+        # better one by more than 50%, until the top highlights are found
+        kept = []
+        for i in range(len(highlights)):
+            if not kept or not (overlap_ratio[i, kept] > 0.5).any():
+                kept.append(i)
+                if len(kept) == max_highlights:
                     break
-            
-            if not overlap_found:
-                filtered.append(highlight)
         
-        # Limit to top highlights
-        max_highlights = 5
-        filtered = filtered[:max_highlights]
+        filtered = [highlights[i] for i in kept]
         
         # Ensure minimum quality threshold
         min_confidence = 0.3
@@ -274,23 +450,34 @@ class ContentAnalyzer:
     async def _enrich_highlights(self, highlights: List[Dict[str, Any]], 
                                 video_metadata: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Add titles, descriptions, and hashtags to highlights"""
-        enriched = []
-        
-        for i, highlight in enumerate(highlights):
+        # Highlights are independent, so enrich them concurrently (capped by the semaphore)
+        return list(await asyncio.gather(*[
+            self._enrich_highlight(i, highlight, video_metadata)
+            for i, highlight in enumerate(highlights)
+        ]))
+    
+    async def _enrich_highlight(self, i: int, highlight: Dict[str, Any],
+                                video_metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Add title, description, and hashtags to one highlight"""
+        # Lowercased text from scoring is only needed here, keep it out of the result
+        highlight = dict(highlight)
+        text_lower = highlight.pop('_lower', None)
+        
+        async with self._enrich_semaphore:
             try:
                 # Generate engaging title
-                title = await self._generate_title(highlight['text'], highlight.get('emotions', []))
+                title = await self._generate_title(highlight['text'], highlight.get('emotions', []), text_lower)
                 
                 # Generate description
                 description = await self._generate_description(highlight['text'], video_metadata)
                 
                 # Generate hashtags
-                hashtags = await self._generate_hashtags(highlight['text'], highlight.get('emotions', []))
+                hashtags = await self._generate_hashtags(highlight['text'], highlight.get('emotions', []), text_lower)
                 
                 # Determine primary emotion
                 primary_emotion = self._get_primary_emotion(highlight.get('emotions', []))
                 
-                enriched_highlight = {
+                return {
                     **highlight,
                     'title': title,
                     'description': description,
@@ -300,12 +487,10 @@ class ContentAnalyzer:
                     'clip_number': i + 1
                 }
                 
-                enriched.append(enriched_highlight)
-                
             except Exception as e:
                 logger.warning(f"⚠️ Failed to enrich highlight {i}: {e}")
                 # Add basic version
-                enriched.append({
+                return {
                     **highlight,
                     'title': f"Viral Moment {i + 1}",
                     'description': highlight['text'][:100] + "...",
@@ -313,14 +498,28 @@ class ContentAnalyzer:
                     'emotion': 'neutral',
                     'engagement_score': highlight.get('confidence', 0.5),
                     'clip_number': i + 1
-                })
-        
-        return enriched
+                }
+    
+    def _remember(self, cache: Dict[Any, Any], key: Any, value: Any):
+        """Store a result in a bounded cache, dropping the oldest entries"""
+        cache[key] = value
+        while len(cache) > self._enrich_cache_size:
+            del cache[next(iter(cache))]
     
-    async def _generate_title(self, text: str, emotions: List[str]) -> str:
-        """Generate an engaging title for the highlight"""
+    async def _generate_title(self, text: str, emotions: List[str], text_lower: Optional[str] = None) -> str:
+        """Generate an engaging title for the highlight (text_lower: text.lower() if already known)"""
+        key = (text, tuple(emotions))
+        title = self._title_cache.get(key)
+        if title is None:
+            title = self._resolve_title(text, emotions, text_lower or text.lower())
+            self._remember(self._title_cache, key, title)
+        
+        # Fallback to template (picked again on every call, only the templates are cached)
+        return title if isinstance(title, str) else random.choice(title)
+    
+    def _resolve_title(self, text: str, emotions: List[str], text_lower: str):
+        """Title extracted from the text, or the templates to pick one from"""
         # Simple rule-based title generation (can be enhanced with LLM)
-        words = text.split()
         
         # Title templates based on emotions
         if 'funny' in emotions:
@@ -353,8 +552,8 @@ class ContentAnalyzer:
             ]
         
         # Try to extract key phrases
-        for keyword in self.boost_keywords:
-            if keyword.lower() in text.lower():
+        for keyword, keyword_lower in zip(self.boost_keywords, self._boost_lower):
+            if keyword_lower in text_lower:
                 return f"The {keyword.title()} Secret"
         
         # Look for question patterns
@@ -365,9 +564,7 @@ class ContentAnalyzer:
                 if len(question.split()) <= 8:
                     return question.title()
         
-        # Fallback to template
-        import random
-        return random.choice(templates)
+        return templates
     
     async def _generate_description(self, text: str, video_metadata: Dict[str, Any]) -> str:
         """Generate description for the highlight"""
@@ -382,54 +579,40 @@ class ContentAnalyzer:
         
         return description
     
-    async def _generate_hashtags(self, text: str, emotions: List[str]) -> List[str]:
-        """Generate relevant hashtags for the highlight"""
-        hashtags = []
-        hashtag_config = self.config.get_hashtag_config()
-        
+    async def _generate_hashtags(self, text: str, emotions: List[str], text_lower: Optional[str] = None) -> List[str]:
+        """Generate relevant hashtags for the highlight (text_lower: text.lower() if already known)"""
+        key = (text, tuple(emotions))
+        hashtags = self._hashtag_cache.get(key)
+        if hashtags is None:
+            hashtags = self._build_hashtags(emotions, text_lower or text.lower())
+            self._remember(self._hashtag_cache, key, hashtags)
+        
+        return list(hashtags)
+    
+    def _build_hashtags(self, emotions: List[str], text_lower: str) -> List[str]:
+        """Hashtags for a highlight's emotions and lowercased text"""
         # Base hashtags
-        base_tags = ['#viral', '#trending', '#fyp']
-        hashtags.extend(base_tags)
+        hashtags = list(BASE_HASHTAGS)
         
         # Emotion-based hashtags
-        emotion_tags = {
-            'funny': ['#comedy', '#humor', '#laugh'],
-            'shocking': ['#mindblown', '#incredible', '#wow'],
-            'inspirational': ['#motivation', '#inspiration', '#success'],
-            'educational': ['#learning', '#facts', '#knowledge'],
-            'controversial': ['#debate', '#opinion', '#discussion']
-        }
-        
         for emotion in emotions:
-            if emotion in emotion_tags:
-                hashtags.extend(emotion_tags[emotion])
-        
-        # Extract topic-related hashtags from text
-        text_lower = text.lower()
-        
-        # Common topic keywords
-        topic_keywords = {
-            'business': '#business', 'money': '#money', 'success': '#success',
-            'health': '#health', 'fitness': '#fitness', 'food': '#food',
-            'technology': '#tech', 'ai': '#ai', 'science': '#science',
-            'travel': '#travel', 'lifestyle': '#lifestyle', 'tips': '#tips'
-        }
+            hashtags.extend(EMOTION_HASHTAGS.get(emotion, ()))
         
-        for keyword, tag in topic_keywords.items():
-            if keyword in text_lower:
-                hashtags.append(tag)
+        # Extract topic-related hashtags from text (in table order)
+        topics = set(_TOPIC_RE.findall(text_lower))
+        if topics:
+            hashtags.extend(tag for keyword, tag in TOPIC_HASHTAGS.items() if keyword in topics)
         
         # Remove duplicates and limit count
         hashtags = list(dict.fromkeys(hashtags))  # Remove duplicates preserving order
-        max_count = hashtag_config.get("max_count", 10)
-        min_count = hashtag_config.get("min_count", 5)
+        max_count = self.hashtag_config.get("max_count", 10)
+        min_count = self.hashtag_config.get("min_count", 5)
         
         if len(hashtags) > max_count:
             hashtags = hashtags[:max_count]
         elif len(hashtags) < min_count:
             # Add generic hashtags to reach minimum
-            generic_tags = ['#content', '#video', '#shorts', '#reels', '#tiktok']
-            for tag in generic_tags:
+            for tag in GENERIC_HASHTAGS:
                 if tag not in hashtags and len(hashtags) < min_count:
                     hashtags.append(tag)
         
@@ -437,14 +620,4 @@ class ContentAnalyzer:
     
     def _get_primary_emotion(self, emotions: List[str]) -> str:
         """Get the primary emotion from a list of emotions"""
-        if not emotions:
-            return 'neutral'
-        
-        # Priority order for emotions
-        emotion_priority = ['funny', 'shocking', 'inspirational', 'controversial', 'educational']
-        
-        for emotion in emotion_priority:
-            if emotion in emotions:
-                return emotion
-        
-        return emotions[0] if emotions else 'neutral'
+        return _primary_emotion(tuple(emotions))
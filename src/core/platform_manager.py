@@ -91,49 +91,18 @@ class PlatformManager:
                 logger.warning("⚠️ No platforms available for posting")
                 return {"success": False, "message": "No platforms enabled"}
             
-            results = {
-                "total_clips": len(clips),
-                "successful_posts": 0,
-                "failed_posts": 0,
-                "platform_results": {},
-                "post_details": []
-            }
-            
             # Check if we should schedule posts or post immediately
-            scheduler_config = self.config.get_scheduler_config()
-            if scheduler_config.get("enabled", True):
+            if self.is_scheduling_enabled():
                 # Schedule posts for optimal times
                 await self._schedule_posts(clips)
+                results = self.summarize_post_results([], len(clips))
                 results["message"] = "Posts scheduled for optimal times"
             else:
                 # Post immediately
-                for clip in clips:
-                    clip_results = await self._post_clip_to_platforms(clip)
-                    results["post_details"].append(clip_results)
-                    
-                    # Update counters
-                    for platform, result in clip_results["platforms"].items():
-                        if result["success"]:
-                            results["successful_posts"] += 1
-                        else:
-                            results["failed_posts"] += 1
-                
+                clip_results = [await self._post_clip_to_platforms(clip) for clip in clips]
+                results = self.summarize_post_results(clip_results, len(clips))
                 results["message"] = "Posts completed immediately"
             
-            # Calculate platform-specific results
-            for platform_name in self.platforms.keys():
-                platform_posts = [
-                    detail["platforms"].get(platform_name, {}) 
-                    for detail in results["post_details"]
-                ]
-                successful = sum(1 for post in platform_posts if post.get("success", False))
-                
-                results["platform_results"][platform_name] = {
-                    "total": len(platform_posts),
-                    "successful": successful,
-                    "failed": len(platform_posts) - successful
-                }
-            
             logger.success(f"📊 Multi-platform posting complete: {results['successful_posts']} successful, {results['failed_posts']} failed")
             return results
             
@@ -149,6 +118,73 @@ class PlatformManager:
                 "post_details": []
             }
     
+    def is_scheduling_enabled(self) -> bool:
+        """Check whether clips are queued for optimal times instead of posted right away"""
+        return self.config.get_scheduler_config().get("enabled", True)
+    
+    async def post_clip(self, clip: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Post a single clip to all enabled platforms immediately
+        
+        Args:
+            clip: Clip data dictionary
+            
+        Returns:
+            Per-platform results for the clip
+        """
+        if not self.platforms:
+            logger.warning("⚠️ No platforms available for posting")
+            return {
+                "clip_id": clip["clip_id"],
+                "clip_title": clip["title"],
+                "platforms": {}
+            }
+        
+        return await self._post_clip_to_platforms(clip)
+    
+    def summarize_post_results(self, clip_results: List[Dict[str, Any]], total_clips: int) -> Dict[str, Any]:
+        """
+        Aggregate per-clip posting results into overall counters
+        
+        Args:
+            clip_results: Results returned by post_clip for each clip
+            total_clips: Number of clips that were submitted
+            
+        Returns:
+            Dictionary with posting results
+        """
+        results = {
+            "total_clips": total_clips,
+            "successful_posts": 0,
+            "failed_posts": 0,
+            "platform_results": {},
+            "post_details": list(clip_results)
+        }
+        
+        # Update counters
+        for detail in results["post_details"]:
+            for platform, result in detail["platforms"].items():
+                if result["success"]:
+                    results["successful_posts"] += 1
+                else:
+                    results["failed_posts"] += 1
+        
+        # Calculate platform-specific results
+        for platform_name in self.platforms.keys():
+            platform_posts = [
+                detail["platforms"].get(platform_name, {}) 
+                for detail in results["post_details"]
+            ]
+            successful = sum(1 for post in platform_posts if post.get("success", False))
+            
+            results["platform_results"][platform_name] = {
+                "total": len(platform_posts),
+                "successful": successful,
+                "failed": len(platform_posts) - successful
+            }
+        
+        return results
+    
     async def _post_clip_to_platforms(self, clip: Dict[str, Any]) -> Dict[str, Any]:
         """Post a single clip to all platforms"""
         logger.info(f"📤 Posting clip: {clip['title']}")
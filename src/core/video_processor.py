@@ -60,6 +60,7 @@ class VideoProcessor:
         except Exception as e:
             logger.error(f"❌ Failed to load Whisper model: {e}")
             self.whisper_model = None
+        self._whisper_lock = asyncio.Lock()
         
         # Ensure directories exist
         self.download_path = Path(self.video_config.get("download_path", "./downloads"))
@@ -112,8 +113,8 @@ class VideoProcessor:
             ydl_opts['match_filter'] = lambda info_dict: None if info_dict.get('duration', 0) <= max_duration else "Video too long"
             
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                # Extract info first
-                info = ydl.extract_info(url, download=False)
+                # Extract info first (yt-dlp blocks, keep it off the event loop)
+                info = await asyncio.to_thread(ydl.extract_info, url, download=False)
                 
                 if not info:
                     logger.error("❌ Failed to extract video information")
@@ -126,7 +127,7 @@ class VideoProcessor:
                     return None
                 
                 # Download the video
-                ydl.download([url])
+                await asyncio.to_thread(ydl.download, [url])
                 
                 # Find downloaded video file
                 video_file = None
@@ -160,6 +161,10 @@ class VideoProcessor:
             logger.error(f"❌ Error downloading video: {e}")
             return None
     
+    def _audio_path(self, video_path: str) -> Path:
+        """Temporary WAV file used while transcribing a video"""
+        return self.temp_path / f"audio_{Path(video_path).stem}.wav"
+    
     async def transcribe_video(self, video_path: str) -> Optional[Dict[str, Any]]:
         """
         Transcribe video using Whisper
@@ -178,16 +183,16 @@ class VideoProcessor:
             logger.info(f"🎙️ Transcribing video: {video_path}")
             
             # Extract audio first for better performance
-            audio_file = self.temp_path / f"audio_{Path(video_path).stem}.wav"
+            audio_file = self._audio_path(video_path)
             
             # Use ffmpeg to extract audio
-            (
+            extract_audio = (
                 ffmpeg
                 .input(video_path)
                 .output(str(audio_file), acodec='pcm_s16le', ac=1, ar='16k')
                 .overwrite_output()
-                .run(quiet=True, capture_stdout=True)
             )
+            await asyncio.to_thread(extract_audio.run, quiet=True, capture_stdout=True)
             
             # Transcribe audio
             whisper_config = self.ai_config.get("whisper", {})
@@ -195,12 +200,15 @@ class VideoProcessor:
             if language == "auto":
                 language = None
             
-            result = self.whisper_model.transcribe(
-                str(audio_file),
-                language=language,
-                word_timestamps=True,
-                verbose=False
-            )
+            # The model is shared, so only one transcription runs at a time
+            async with self._whisper_lock:
+                result = await asyncio.to_thread(
+                    self.whisper_model.transcribe,
+                    str(audio_file),
+                    language=language,
+                    word_timestamps=True,
+                    verbose=False
+                )
             
             # Clean up audio file
             audio_file.unlink(missing_ok=True)
@@ -238,6 +246,22 @@ class VideoProcessor:
         Returns:
             Complete video data with transcript
         """
+        video_data = await self.prepare_input(input_source)
+        if not video_data:
+            return None
+        
+        return await self.transcribe_input(video_data)
+    
+    async def prepare_input(self, input_source: str) -> Optional[Dict[str, Any]]:
+        """
+        Download or locate the input video and collect its metadata
+        
+        Args:
+            input_source: YouTube URL or local file path
+            
+        Returns:
+            Video data without transcript
+        """
         try:
             if self._is_url(input_source):
                 # Download from URL
@@ -277,6 +301,28 @@ class VideoProcessor:
             except Exception as e:
                 logger.warning(f"⚠️ Could not get video info: {e}")
             
+            return video_data
+            
+        except Exception as e:
+            logger.error(f"❌ Error processing input: {e}")
+            return None
+    
+    async def transcribe_input(self, video_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Transcribe a prepared video and attach transcript and file metadata
+        
+        Args:
+            video_data: Video data returned by prepare_input
+            
+        Returns:
+            Complete video data with transcript
+        """
+        try:
+            video_path = video_data['file_path']
+            
+            # Track temp files so cleanup can remove them without scanning
+            video_data.setdefault('temp_files', []).append(str(self._audio_path(video_path)))
+            
             # Transcribe the video
             transcript = await self.transcribe_video(video_path)
             if not transcript:
@@ -319,6 +365,8 @@ class VideoProcessor:
             # Generate clip filename
             clip_id = f"{video_data['video_id']}_{int(start_time)}_{int(end_time)}"
             output_file = self.output_path / f"{clip_id}.mp4"
+            temp_audio_file = self.temp_path / f"temp_audio_{clip_id}.m4a"
+            video_data.setdefault('temp_files', []).append(str(temp_audio_file))
             
             # Load video
             with VideoFileClip(video_data['file_path']) as video:
@@ -362,14 +410,16 @@ class VideoProcessor:
                 fps = self.video_config.get("fps", 30)
                 bitrate = self.video_config.get("bitrate", "2M")
                 
-                # Write the video file
+                # Write the video file off the event loop so several clips
+                # can encode at once
                 try:
-                    clip.write_videofile(
+                    await asyncio.to_thread(
+                        clip.write_videofile,
                         str(output_file),
                         fps=fps,
                         bitrate=bitrate,
                         audio_bitrate=self.video_config.get("audio_bitrate", "128k"),
-                        temp_audiofile=str(self.temp_path / f"temp_audio_{clip_id}.m4a"),
+                        temp_audiofile=str(temp_audio_file),
                         remove_temp=True,
                         verbose=False,
                         logger=None,
@@ -379,7 +429,8 @@ class VideoProcessor:
                 except Exception as e:
                     logger.warning(f"⚠️ Failed with temp audio file, trying without: {e}")
                     # Fallback without temp audio file
-                    clip.write_videofile(
+                    await asyncio.to_thread(
+                        clip.write_videofile,
                         str(output_file),
                         fps=fps,
                         bitrate=bitrate,
@@ -5,9 +5,12 @@ Configuration management for Clippy
 import yaml
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from loguru import logger
 
+# Marks keys that did not exist before an update, so undoing it removes them
+_MISSING = object()
+
 
 class Config:
     """Configuration manager for Clippy application"""
@@ -61,16 +64,54 @@ class Config:
             key: Configuration key (supports dot notation)
             value: Value to set
         """
+        self._set_in(self._config, key, value)
+    
+    def update(self, values: Dict[str, Any]):
+        """
+        Set several configuration values at once
+        
+        Values are set in place, like set(), so sections already handed out
+        see the new values. If any key fails, every change made so far is
+        undone in place (the same section dicts stay in use) before the
+        error is raised.
+        
+        Args:
+            values: Mapping of configuration key (dot notation) to value
+        """
+        undo: List[Tuple[Dict[str, Any], str, Any]] = []
+        try:
+            for key, value in values.items():
+                self._set_in(self._config, key, value, undo)
+        except Exception:
+            for parent, k, old_value in reversed(undo):
+                if old_value is _MISSING:
+                    parent.pop(k, None)
+                else:
+                    parent[k] = old_value
+            raise
+    
+    @staticmethod
+    def _set_in(config: Dict[str, Any], key: str, value: Any,
+                undo: Optional[List[Tuple[Dict[str, Any], str, Any]]] = None):
+        """
+        Set a dot notation key in a configuration dictionary
+        
+        If undo is given, each (parent dict, key, previous value) changed is
+        appended to it, with _MISSING for keys that did not exist.
+        """
         keys = key.split('.')
-        config = self._config
         
         # Navigate to the parent of the target key
         for k in keys[:-1]:
             if k not in config:
+                if undo is not None:
+                    undo.append((config, k, _MISSING))
                 config[k] = {}
             config = config[k]
         
         # Set the final value
+        if undo is not None:
+            undo.append((config, keys[-1], config.get(keys[-1], _MISSING)))
         config[keys[-1]] = value
     
     def save_config(self):
@@ -0,0 +1,85 @@
+"""
+Batched filesystem helpers for Clippy
+"""
+
+import os
+import stat
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from loguru import logger
+
+
+def unlink_with_size(path: Union[str, Path]) -> Optional[int]:
+    """
+    Delete a single file and report its size
+    
+    One stat and one unlink per file; a missing file is detected by the
+    stat itself instead of a separate exists() check.
+    
+    Args:
+        path: File to delete
+    
+    Returns:
+        Size in bytes of the deleted file, or None if it was missing,
+        not a regular file or could not be deleted
+    """
+    try:
+        file_stat = os.stat(path)
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None
+        os.unlink(path)
+        return file_stat.st_size
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning(f"⚠️ Could not delete {path}: {e}")
+        return None
+
+
+def unlink_with_sizes(paths: List[Union[str, Path]]) -> List[Optional[int]]:
+    """
+    Delete a batch of files and report how much space each one freed
+    
+    Args:
+        paths: Files to delete
+    
+    Returns:
+        Size in bytes of each deleted file, aligned with paths
+        (None for paths that were missing, not regular files or failed)
+    """
+    return [unlink_with_size(path) for path in paths]
+
+
+def unlink_matching(directory: Union[str, Path], name_part: str) -> List[Tuple[Path, int]]:
+    """
+    Delete every regular file in a directory whose name contains name_part
+    
+    Uses os.scandir, whose entries carry the file type (and on Windows the
+    size) from the directory read itself, instead of globbing and then
+    statting each match again.
+    
+    Args:
+        directory: Directory to scan (not recursive)
+        name_part: Substring the file name must contain
+    
+    Returns:
+        List of (path, size in bytes) for each deleted file
+    """
+    deleted = []
+    
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if name_part not in entry.name or not entry.is_file(follow_symlinks=False):
+                    continue
+                try:
+                    file_size = entry.stat(follow_symlinks=False).st_size
+                    os.unlink(entry.path)
+                    deleted.append((Path(entry.path), file_size))
+                except OSError as e:
+                    logger.warning(f"⚠️ Could not delete {entry.path}: {e}")
+    except FileNotFoundError:
+        pass
+    
+    return deleted
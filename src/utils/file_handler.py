@@ -13,6 +13,26 @@ from datetime import datetime
 
 from loguru import logger
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.debug("orjson not available, using the standard json module. Install with: pip install orjson")
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    logger.debug("zstandard not available, analytics snapshots are stored uncompressed. Install with: pip install zstandard")
+
+# First bytes of every zstd frame, used to recognise compressed files
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Buffer size for JSON reads and writes
+JSON_BUFFER_SIZE = 1024 * 1024
+
 
 class FileHandler:
     """Utilities for file operations and management"""
@@ -211,14 +231,24 @@ class FileHandler:
             return 0
     
     def save_json(self, data: Any, file_path: Union[str, Path], 
-                  indent: int = 2, ensure_ascii: bool = False) -> bool:
+                  indent: int = 2, ensure_ascii: bool = False,
+                  bufsize: int = JSON_BUFFER_SIZE) -> bool:
         """Save data to JSON file"""
         try:
             file_path = Path(file_path)
             file_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=indent, ensure_ascii=ensure_ascii, default=str)
+            # orjson only indents by 2 and always writes UTF-8
+            if ORJSON_AVAILABLE and indent in (None, 2) and not ensure_ascii:
+                options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                if indent:
+                    options |= orjson.OPT_INDENT_2
+                with open(file_path, 'wb', buffering=bufsize) as f:
+                    f.write(orjson.dumps(data, default=str, option=options))
+            else:
+                # json.dump emits many small chunks, a large buffer batches them
+                with open(file_path, 'w', encoding='utf-8', buffering=bufsize) as f:
+                    json.dump(data, f, indent=indent, ensure_ascii=ensure_ascii, default=str)
             
             logger.debug(f"💾 Saved JSON: {file_path}")
             return True
@@ -227,7 +257,39 @@ class FileHandler:
             logger.error(f"❌ Error saving JSON: {e}")
             return False
     
-    def load_json(self, file_path: Union[str, Path]) -> Optional[Any]:
+    def dumps_json(self, data: Any, indent: int = 2) -> bytes:
+        """Serialize data to UTF-8 JSON bytes"""
+        if ORJSON_AVAILABLE and indent in (None, 2):
+            options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            if indent:
+                options |= orjson.OPT_INDENT_2
+            return orjson.dumps(data, default=str, option=options)
+        return json.dumps(data, indent=indent, ensure_ascii=False, default=str).encode('utf-8')
+    
+    def compress_bytes(self, payload: bytes, level: int = 3) -> bytes:
+        """Compress bytes with zstd (requires zstandard)"""
+        return zstandard.ZstdCompressor(level=level).compress(payload)
+    
+    def write_bytes_atomic(self, payload: bytes, file_path: Union[str, Path],
+                           bufsize: int = JSON_BUFFER_SIZE) -> bool:
+        """Write bytes to a temp file and rename it over the target"""
+        try:
+            file_path = Path(file_path)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = file_path.with_name(file_path.name + ".tmp")
+            
+            with open(tmp_path, 'wb', buffering=bufsize) as f:
+                f.write(payload)
+            os.replace(tmp_path, file_path)
+            
+            logger.debug(f"💾 Saved file: {file_path}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Error writing file: {e}")
+            return False
+    
+    def load_json(self, file_path: Union[str, Path], bufsize: int = JSON_BUFFER_SIZE) -> Optional[Any]:
         """Load data from JSON file"""
         try:
             file_path = Path(file_path)
@@ -236,8 +298,17 @@ class FileHandler:
                 logger.warning(f"⚠️ JSON file not found: {file_path}")
                 return None
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            with open(file_path, 'rb', buffering=bufsize) as f:
+                raw = f.read()
+            
+            # zstd-compressed files are recognised by their magic bytes
+            if raw.startswith(ZSTD_MAGIC):
+                if not ZSTD_AVAILABLE:
+                    logger.error(f"❌ {file_path} is zstd-compressed. Install with: pip install zstandard")
+                    return None
+                raw = zstandard.ZstdDecompressor().decompress(raw)
+            
+            data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
             
             logger.debug(f"📖 Loaded JSON: {file_path}")
             return data
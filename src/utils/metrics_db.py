@@ -0,0 +1,150 @@
+"""
+SQLite storage for engagement metrics
+"""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+from loguru import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clips (
+    clip_id TEXT PRIMARY KEY,
+    emotion TEXT,
+    duration NUMERIC,
+    posted_hour INTEGER,
+    posted_weekday INTEGER,
+    performance_score REAL,
+    is_viral INTEGER,
+    title TEXT,
+    posted_at TEXT,
+    last_updated TEXT,
+    data TEXT
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    clip_id TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    metric_type TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (clip_id, platform, metric_type)
+);
+CREATE INDEX IF NOT EXISTS idx_clips_emotion ON clips (emotion);
+CREATE INDEX IF NOT EXISTS idx_clips_is_viral ON clips (is_viral);
+CREATE INDEX IF NOT EXISTS idx_clips_posted_hour ON clips (posted_hour);
+"""
+
+# Entry fields kept in their own columns; everything else goes in the data blob
+COLUMN_FIELDS = (
+    "emotion", "duration", "posted_hour", "posted_weekday", "performance_score",
+    "is_viral", "title", "posted_at", "last_updated"
+)
+
+
+class MetricsDB:
+    """
+    Engagement metrics stored one row per clip and one row per
+    (clip, platform, metric), so an update touches only the rows it changes
+    
+    The connection runs in WAL mode with synchronous=NORMAL: writes append
+    to the WAL without an fsync per commit and a crash never leaves a
+    half-written database. Methods are blocking; call them through
+    asyncio.to_thread from async code.
+    """
+    
+    def __init__(self, db_path: Union[str, Path]):
+        """Open (and create if needed) the metrics database"""
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Autocommit mode, transactions are opened explicitly in write_changes
+        self.db = sqlite3.connect(str(self.db_path), isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+    
+    def load_entries(self, metric_types: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Rebuild tracking entries from the database
+        
+        Args:
+            metric_types: Metric names every entry carries (missing ones start empty)
+        
+        Returns:
+            Dictionary of clip_id -> tracking entry
+        """
+        entries = {}
+        
+        try:
+            columns = ", ".join(COLUMN_FIELDS)
+            for row in self.db.execute(f"SELECT clip_id, {columns}, data FROM clips"):
+                clip_id = row[0]
+                entry = json.loads(row[-1]) if row[-1] else {}
+                entry["clip_id"] = clip_id
+                entry.update(zip(COLUMN_FIELDS, row[1:-1]))
+                entry["is_viral"] = bool(entry["is_viral"])
+                entry["metrics"] = {metric_type: {} for metric_type in metric_types}
+                entries[clip_id] = entry
+            
+            for clip_id, platform, metric_type, value in self.db.execute(
+                "SELECT clip_id, platform, metric_type, value FROM metrics"
+            ):
+                entry = entries.get(clip_id)
+                if entry is not None and metric_type in entry["metrics"]:
+                    entry["metrics"][metric_type][platform] = value
+            
+            logger.debug(f"📖 Loaded {len(entries)} tracked clips from {self.db_path}")
+        
+        except Exception as e:
+            logger.error(f"❌ Error loading metrics database: {e}")
+        
+        return entries
+    
+    @staticmethod
+    def clip_row(entry: Dict[str, Any]) -> Tuple:
+        """
+        Build the clips table row for a tracking entry
+        
+        Call this where the entry can't change underneath it (on the event
+        loop), then hand the rows to write_changes.
+        """
+        data = {
+            key: value for key, value in entry.items()
+            if key not in COLUMN_FIELDS and key not in ("clip_id", "metrics", "_totals")
+        }
+        values = [entry.get(field) for field in COLUMN_FIELDS]
+        values[COLUMN_FIELDS.index("is_viral")] = int(bool(entry.get("is_viral")))
+        return (entry["clip_id"], *values, json.dumps(data, default=str))
+    
+    def write_changes(self, clip_rows: List[Tuple], metric_rows: List[Tuple]):
+        """
+        Upsert clip and metric rows in a single transaction
+        
+        Args:
+            clip_rows: Rows built with clip_row
+            metric_rows: (clip_id, platform, metric_type, value) tuples
+        """
+        columns = ("clip_id",) + COLUMN_FIELDS + ("data",)
+        placeholders = ", ".join("?" * len(columns))
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+        
+        with self.db:
+            self.db.execute("BEGIN")
+            self.db.executemany(
+                f"INSERT INTO clips ({', '.join(columns)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(clip_id) DO UPDATE SET {updates}",
+                clip_rows
+            )
+            self.db.executemany(
+                "INSERT INTO metrics (clip_id, platform, metric_type, value) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(clip_id, platform, metric_type) DO UPDATE SET value = excluded.value",
+                metric_rows
+            )
+    
+    def close(self):
+        """Close the database connection"""
+        try:
+            self.db.close()
+        except Exception as e:
+            logger.warning(f"⚠️ Error closing metrics database: {e}")